@@ -0,0 +1,51 @@
+"""
+Gunicorn configuration for production.
+
+Loaded automatically when running ``gunicorn`` from the project root.
+Every value can be overridden with the matching GUNICORN_* environment
+variable or on the command line.
+"""
+
+import multiprocessing
+import os
+
+# Application factory (src.app.create_app)
+wsgi_app = "src.app:create_app()"
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:5010")
+
+# gevent workers multiplex many slow clients (large uploads, PowerBI pulls)
+# per process instead of blocking one worker per request. The gevent worker
+# monkey-patches the standard library itself when it boots. One worker per
+# CPU is enough for gevent; each one opens its own database pool (see
+# DB_POOL_SIZE and DB_MAX_OVERFLOW in src/config.py), so workers * (5 + 5)
+# connections must fit in PostgreSQL's max_connections.
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gevent")
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count()))
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+# Zone files can take minutes to upload and ingest
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "600"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+
+# Keep connections open between requests (must exceed the proxy idle timeout)
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "75"))
+
+accesslog = "-"
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """
+    Make psycopg2 cooperative under gevent.
+
+    psycopg2 is a C extension that blocks the whole worker while it waits on
+    the database; the psycogreen wait callback makes those waits yield to
+    other greenlets. psycopg 3 is already cooperative once monkey-patched.
+    The worker class in effect is checked (gevent, gevent_wsgi, a dotted
+    GeventWorker path...), since -k on the command line overrides this file.
+    """
+    if "gevent" in server.cfg.worker_class_str.lower():
+        from psycogreen.gevent import patch_psycopg
+
+        patch_psycopg()
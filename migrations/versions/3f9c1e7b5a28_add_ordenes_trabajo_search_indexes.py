@@ -0,0 +1,32 @@
+"""add_ordenes_trabajo_search_indexes
+
+Revision ID: 3f9c1e7b5a28
+Revises: b6e2a9d4c371
+Create Date: 2025-08-25 11:52:37.610294
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c1e7b5a28'
+down_revision = 'b6e2a9d4c371'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # gin_trgm_ops comes from pg_trgm
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    with op.batch_alter_table('ordenes_trabajo', schema=None) as batch_op:
+        batch_op.create_index('ix_ordenes_trabajo_empresa_created', ['id_empresa', sa.text('created_at DESC')], unique=False, postgresql_where=sa.text('active = true'))
+        batch_op.create_index('ix_ordenes_trabajo_codigo_trgm', ['codigo'], unique=False, postgresql_using='gin', postgresql_ops={'codigo': 'gin_trgm_ops'})
+
+
+def downgrade():
+    # pg_trgm is left installed; other objects may depend on it
+    with op.batch_alter_table('ordenes_trabajo', schema=None) as batch_op:
+        batch_op.drop_index('ix_ordenes_trabajo_codigo_trgm', postgresql_using='gin')
+        batch_op.drop_index('ix_ordenes_trabajo_empresa_created', postgresql_where=sa.text('active = true'))
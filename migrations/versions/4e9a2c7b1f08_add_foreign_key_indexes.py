@@ -0,0 +1,45 @@
+"""add_foreign_key_indexes
+
+Revision ID: 4e9a2c7b1f08
+Revises: c3f8a1d5e7b9
+Create Date: 2025-08-21 15:03:18.227640
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e9a2c7b1f08'
+down_revision = 'c3f8a1d5e7b9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # PostgreSQL does not index foreign key columns on its own
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_comentarios_id_orden_trabajo'), ['id_orden_trabajo'], unique=False)
+        batch_op.create_index(batch_op.f('ix_comentarios_id_usuario'), ['id_usuario'], unique=False)
+        batch_op.create_index(batch_op.f('ix_comentarios_num_ticket'), ['num_ticket'], unique=False)
+
+    with op.batch_alter_table('ordenes_trabajo', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ordenes_trabajo_id_empresa'), ['id_empresa'], unique=False)
+
+    with op.batch_alter_table('tecnicos_supervisores', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_tecnicos_supervisores_id_empresa'), ['id_empresa'], unique=False)
+        batch_op.create_index(batch_op.f('ix_tecnicos_supervisores_rut_tecnico'), ['rut_tecnico'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('tecnicos_supervisores', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_tecnicos_supervisores_rut_tecnico'))
+        batch_op.drop_index(batch_op.f('ix_tecnicos_supervisores_id_empresa'))
+
+    with op.batch_alter_table('ordenes_trabajo', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ordenes_trabajo_id_empresa'))
+
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_comentarios_num_ticket'))
+        batch_op.drop_index(batch_op.f('ix_comentarios_id_usuario'))
+        batch_op.drop_index(batch_op.f('ix_comentarios_id_orden_trabajo'))
@@ -0,0 +1,41 @@
+"""add_upload_jobs_table
+
+Revision ID: 5c1e7d2a9b40
+Revises: 2a2cc1ab9823
+Create Date: 2025-08-20 10:12:41.318205
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5c1e7d2a9b40'
+down_revision = '2a2cc1ab9823'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('upload_jobs',
+    sa.Column('kind', sa.String(length=64), nullable=False),
+    sa.Column('status', sa.String(length=16), nullable=False),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.String(length=512), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('uuid', sa.String(length=36), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('active', sa.Boolean(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('uuid')
+    )
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_upload_jobs_active'), ['active'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('upload_jobs', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_upload_jobs_active'))
+
+    op.drop_table('upload_jobs')
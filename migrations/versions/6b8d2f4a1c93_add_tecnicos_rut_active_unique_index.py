@@ -0,0 +1,48 @@
+"""add_tecnicos_rut_active_unique_index
+
+Revision ID: 6b8d2f4a1c93
+Revises: 7c5e1a9d3b46
+Create Date: 2025-08-26 10:21:47.118305
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '6b8d2f4a1c93'
+down_revision = '7c5e1a9d3b46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Earlier re-imports may have left repeated active RUTs. Which row to keep
+    # is a business decision (they can belong to different empresas), so stop
+    # and list them instead of deactivating rows here.
+    duplicated = op.get_bind().execute(
+        sa.text(
+            """
+            SELECT rut_tecnico, count(*)
+            FROM tecnicos_supervisores
+            WHERE active = true
+            GROUP BY rut_tecnico
+            HAVING count(*) > 1
+            ORDER BY rut_tecnico
+            """
+        )
+    ).all()
+    if duplicated:
+        conflicts = "\n".join(f"  {rut} ({count} rows)" for rut, count in duplicated)
+        raise RuntimeError(
+            "Active tecnicos_supervisores rows share a RUT; deactivate all but "
+            "one of each before running this migration:\n" + conflicts
+        )
+
+    with op.batch_alter_table('tecnicos_supervisores', schema=None) as batch_op:
+        batch_op.create_index('uq_tecnicos_supervisores_rut_active', ['rut_tecnico'], unique=True, postgresql_where=sa.text('active = true'))
+
+
+def downgrade():
+    with op.batch_alter_table('tecnicos_supervisores', schema=None) as batch_op:
+        batch_op.drop_index('uq_tecnicos_supervisores_rut_active', postgresql_where=sa.text('active = true'))
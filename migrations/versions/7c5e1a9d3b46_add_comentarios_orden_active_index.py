@@ -0,0 +1,26 @@
+"""add_comentarios_orden_active_index
+
+Revision ID: 7c5e1a9d3b46
+Revises: 3f9c1e7b5a28
+Create Date: 2025-08-25 16:08:14.382915
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c5e1a9d3b46'
+down_revision = '3f9c1e7b5a28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.create_index('ix_comentarios_orden_active', ['id_orden_trabajo'], unique=False, postgresql_where=sa.text('active = true'))
+
+
+def downgrade():
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.drop_index('ix_comentarios_orden_active', postgresql_where=sa.text('active = true'))
@@ -0,0 +1,50 @@
+"""server_default_timestamps
+
+Revision ID: 8a3d5f2c6e14
+Revises: f1b7c4e9a263
+Create Date: 2025-08-22 16:40:09.732118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8a3d5f2c6e14'
+down_revision = 'f1b7c4e9a263'
+branch_labels = None
+depends_on = None
+
+TABLES = (
+    'comentarios',
+    'empresas_externas_toa',
+    'historia_ot_empresas',
+    'ordenes_trabajo',
+    'roles',
+    'tecnicos_supervisores',
+    'upload_jobs',
+    'user_empresas',
+    'user_roles',
+    'users',
+)
+
+
+def upgrade():
+    # created_at/updated_at are now filled in by the database clock
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column in ('created_at', 'updated_at'):
+                batch_op.alter_column(column,
+                       existing_type=sa.DateTime(),
+                       existing_nullable=False,
+                       server_default=sa.text('now()'))
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            for column in ('created_at', 'updated_at'):
+                batch_op.alter_column(column,
+                       existing_type=sa.DateTime(),
+                       existing_nullable=False,
+                       server_default=None)
@@ -0,0 +1,32 @@
+"""add_historia_ot_empresas_indexes
+
+Revision ID: 9d4b6f1e3a72
+Revises: 5c1e7d2a9b40
+Create Date: 2025-08-21 09:41:07.562913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9d4b6f1e3a72'
+down_revision = '5c1e7d2a9b40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('historia_ot_empresas', schema=None) as batch_op:
+        batch_op.create_index('ix_hist_zona_fecha', ['zona', 'fecha'], unique=False)
+        batch_op.create_index('ix_hist_empresa_fecha', ['empresa', 'fecha'], unique=False)
+        batch_op.create_index('ix_hist_ot_fecha', ['orden_de_trabajo', 'fecha'], unique=False)
+        batch_op.create_index('ix_hist_fecha', ['fecha'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('historia_ot_empresas', schema=None) as batch_op:
+        batch_op.drop_index('ix_hist_fecha')
+        batch_op.drop_index('ix_hist_ot_fecha')
+        batch_op.drop_index('ix_hist_empresa_fecha')
+        batch_op.drop_index('ix_hist_zona_fecha')
@@ -0,0 +1,85 @@
+"""add_table_versions
+
+Revision ID: a4f7c2e9d815
+Revises: 6b8d2f4a1c93
+Create Date: 2025-08-27 09:42:18.530267
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4f7c2e9d815'
+down_revision = '6b8d2f4a1c93'
+branch_labels = None
+depends_on = None
+
+# Tables behind the conditional (ETag) API listings
+TRACKED_TABLES = (
+    'comentarios',
+    'empresas_externas_toa',
+    'historia_ot_empresas',
+    'ordenes_trabajo',
+    'roles',
+    'tecnicos_supervisores',
+    'user_empresas',
+    'user_roles',
+    'users',
+)
+
+# Counter rows per table; concurrent writers each take a different one
+VERSION_SLOTS = 16
+
+
+def upgrade():
+    op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=64), nullable=False),
+    sa.Column('slot', sa.SmallInteger(), nullable=False),
+    sa.Column('version', sa.BigInteger(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('table_name', 'slot')
+    )
+
+    # The version of a table is the sum of its slots. A statement bumps the
+    # first slot no other open transaction holds (SKIP LOCKED), so writers of
+    # the same table do not wait on each other's commit; they only queue on
+    # slot 0 when more than VERSION_SLOTS transactions write it at once.
+
+    op.execute(
+        """
+        CREATE FUNCTION bump_table_version() RETURNS trigger AS $$
+        DECLARE
+            free_slot smallint;
+        BEGIN
+            SELECT slot INTO free_slot FROM table_versions
+            WHERE table_name = TG_TABLE_NAME
+            ORDER BY slot
+            LIMIT 1
+            FOR UPDATE SKIP LOCKED;
+            IF NOT FOUND THEN
+                free_slot := 0;
+            END IF;
+            UPDATE table_versions SET version = version + 1
+            WHERE table_name = TG_TABLE_NAME AND slot = free_slot;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    for table in TRACKED_TABLES:
+        op.execute(
+            f"INSERT INTO table_versions (table_name, slot) "
+            f"SELECT '{table}', generate_series(0, {VERSION_SLOTS - 1})"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_bump_version "
+            f"AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION bump_table_version()"
+        )
+
+
+def downgrade():
+    for table in TRACKED_TABLES:
+        op.execute(f"DROP TRIGGER {table}_bump_version ON {table}")
+    op.execute("DROP FUNCTION bump_table_version()")
+    op.drop_table('table_versions')
@@ -0,0 +1,29 @@
+"""add_comentarios_orden_created_index
+
+Revision ID: b6e2a9d4c371
+Revises: 8a3d5f2c6e14
+Create Date: 2025-08-25 09:27:51.304416
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e2a9d4c371'
+down_revision = '8a3d5f2c6e14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The composite index also covers lookups by id_orden_trabajo alone
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.create_index('ix_comentarios_orden_created', ['id_orden_trabajo', sa.text('created_at DESC')], unique=False)
+        batch_op.drop_index(batch_op.f('ix_comentarios_id_orden_trabajo'))
+
+
+def downgrade():
+    with op.batch_alter_table('comentarios', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_comentarios_id_orden_trabajo'), ['id_orden_trabajo'], unique=False)
+        batch_op.drop_index('ix_comentarios_orden_created')
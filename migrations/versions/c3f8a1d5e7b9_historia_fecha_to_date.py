@@ -0,0 +1,35 @@
+"""historia_fecha_to_date
+
+Revision ID: c3f8a1d5e7b9
+Revises: 9d4b6f1e3a72
+Create Date: 2025-08-21 11:26:53.804417
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3f8a1d5e7b9'
+down_revision = '9d4b6f1e3a72'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # TOA exports write Fecha as DD/MM/YYYY
+    with op.batch_alter_table('historia_ot_empresas', schema=None) as batch_op:
+        batch_op.alter_column('fecha',
+               existing_type=sa.String(length=128),
+               type_=sa.Date(),
+               existing_nullable=False,
+               postgresql_using="to_date(fecha, 'DD/MM/YYYY')")
+
+
+def downgrade():
+    with op.batch_alter_table('historia_ot_empresas', schema=None) as batch_op:
+        batch_op.alter_column('fecha',
+               existing_type=sa.Date(),
+               type_=sa.String(length=128),
+               existing_nullable=False,
+               postgresql_using="to_char(fecha, 'DD/MM/YYYY')")
@@ -0,0 +1,50 @@
+"""uuid_columns_to_native_uuid
+
+Revision ID: f1b7c4e9a263
+Revises: 4e9a2c7b1f08
+Create Date: 2025-08-22 10:12:41.518203
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7c4e9a263'
+down_revision = '4e9a2c7b1f08'
+branch_labels = None
+depends_on = None
+
+TABLES = (
+    'comentarios',
+    'empresas_externas_toa',
+    'historia_ot_empresas',
+    'ordenes_trabajo',
+    'roles',
+    'tecnicos_supervisores',
+    'upload_jobs',
+    'user_empresas',
+    'user_roles',
+    'users',
+)
+
+
+def upgrade():
+    # 16-byte native uuid instead of the 36-character text form
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('uuid',
+                   existing_type=sa.String(length=36),
+                   type_=sa.Uuid(),
+                   existing_nullable=False,
+                   postgresql_using='uuid::uuid')
+
+
+def downgrade():
+    for table in TABLES:
+        with op.batch_alter_table(table, schema=None) as batch_op:
+            batch_op.alter_column('uuid',
+                   existing_type=sa.Uuid(),
+                   type_=sa.String(length=36),
+                   existing_nullable=False,
+                   postgresql_using='uuid::text')
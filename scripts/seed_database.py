@@ -455,7 +455,6 @@ class DatabaseSeeder:
 
                 # Random date in the last 60 days
                 fecha_base = datetime.now() - timedelta(days=random.randint(1, 60))
-                fecha_str = fecha_base.strftime("%Y-%m-%d")
 
                 historia = HistoriaOtEmpresas(
                     zona=random.choice(zonas),
@@ -470,7 +469,7 @@ class DatabaseSeeder:
                     ),  # Chile latitude range
                     duracion=f"{random.randint(30, 480)} minutos",
                     estado=random.choice(estados),
-                    fecha=fecha_str,
+                    fecha=fecha_base.date(),
                     flag_consulta_vecino=random.choice(["Sí", "No"]),
                     flag_estado_aprovision=random.choice(
                         ["Aprobado", "Pendiente", "Rechazado"]
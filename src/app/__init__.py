@@ -3,13 +3,19 @@ import os
 import time
 
 from src.app.extensions import login_manager, services
+from src.app.request import SpooledUploadRequest
+from src.cache import cache
 from src.config import Config
 from src.models import db, migrate
+from src.utils.json_response import ORJSONProvider
+from src.utils.slow_query_log import register_slow_query_logging
 
 
 def create_app() -> Flask:
     """Application factory pattern"""
     app = Flask(__name__, static_folder="static", template_folder="templates")
+    app.json = ORJSONProvider(app)
+    app.request_class = SpooledUploadRequest
 
     # Load configuration
     app.config.from_object(Config)
@@ -26,8 +32,10 @@ def create_app() -> Flask:
 
     # Initialize extensions
     db.init_app(app)
+    register_slow_query_logging(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
+    cache.init_app(app)
     services.init_app(app)
 
     # Register blueprints
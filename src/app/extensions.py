@@ -6,6 +6,7 @@ from src.services.empresas_externas_service import EmpresasExternasService
 from src.services.historia_iniciados_service import HistoriaIniciadosService
 from src.services.orden_trabajo_service import OrdenTrabajoService
 from src.services.tecnico_supervisor_service import TecnicoSupervisorService
+from src.services.upload_job_service import UploadJobService
 from src.services.user_service import UserService
 from src.use_cases.comentarios.comentarios_use_case import ComentariosUseCase
 from src.use_cases.empresas.empresas_externas_use_case import EmpresasExternasUseCase
@@ -27,6 +28,7 @@ class Services:
         self.comentarios: ComentariosService | None = None
         self.tecnico_supervisor: TecnicoSupervisorService | None = None
         self.user: UserService | None = None
+        self.upload_job: UploadJobService | None = None
         self.historia_iniciados_use_case: HistoriaIniciadosUseCase | None = None
         self.empresas_externas_use_case: EmpresasExternasUseCase | None = None
         self.orden_trabajo_use_case: OrdenTrabajoUseCase | None = None
@@ -53,6 +55,7 @@ class Services:
         self.comentarios = ComentariosService()
         self.tecnico_supervisor = TecnicoSupervisorService()
         self.user = UserService()
+        self.upload_job = UploadJobService()
 
         # Initialize use cases with dependencies
         self.historia_iniciados_use_case = HistoriaIniciadosUseCase(
@@ -87,8 +90,12 @@ login_manager.login_message_category = 'info'
 @login_manager.user_loader
 def load_user(user_id):
     """Load user by ID for Flask-Login."""
+    from sqlalchemy.orm import lazyload
+
+    from src.models import db
     from src.models.auth.user import User
-    return User.query.get(int(user_id))
+    # Empresas are not needed on every request; they load on first access
+    return db.session.get(User, int(user_id), options=[lazyload(User.empresas)])
 
 
 # Global services instance
@@ -0,0 +1,44 @@
+from collections.abc import Callable
+from tempfile import SpooledTemporaryFile
+from typing import IO
+
+from flask import Request, current_app
+
+
+def spool_uploads_in_memory(view: Callable) -> Callable:
+    """
+    Keep the multipart uploads of a view in memory up to UPLOAD_SPOOL_MAX_SIZE.
+
+    Meant for routes whose files are parsed right away and are usually a few
+    MB (the tecnicos Excel); every other route keeps Werkzeug's 500 KB limit,
+    so many concurrent uploads do not pile up in the worker's memory.
+    """
+    view.spool_uploads_in_memory = True
+    return view
+
+
+class SpooledUploadRequest(Request):
+    """
+    Request whose uploaded files stay in memory up to UPLOAD_SPOOL_MAX_SIZE
+    on views marked with spool_uploads_in_memory.
+
+    Werkzeug rolls uploads over to a temporary file past 500 KB; typical
+    Excel rosters are a few MB, so they were written to disk and read back
+    before parsing. Larger uploads still spill to disk.
+    """
+
+    def _get_file_stream(
+        self,
+        total_content_length: int | None,
+        content_type: str | None,
+        filename: str | None = None,
+        content_length: int | None = None,
+    ) -> IO[bytes]:
+        view = current_app.view_functions.get(self.endpoint)
+        if not getattr(view, "spool_uploads_in_memory", False):
+            return super()._get_file_stream(
+                total_content_length, content_type, filename, content_length
+            )
+        return SpooledTemporaryFile(
+            max_size=current_app.config["UPLOAD_SPOOL_MAX_SIZE"], mode="rb+"
+        )
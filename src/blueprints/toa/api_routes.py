@@ -3,26 +3,44 @@ API routes for TOA blueprint that use Basic Authentication.
 These routes are typically used by external systems like PowerBI.
 """
 
-import os
-
 from flask import (
     Blueprint,
     current_app,
+    g,
     jsonify,
     request,
-    send_file,
 )
 
 from src.app.extensions import services
-from src.utils.decorators import require_basic_auth
-from src.utils.image_utils import serve_default_placeholder_image
+from src.constants import resolve_project_path
+from src.models import (
+    Comentario,
+    EmpresasExternasToa,
+    HistoriaOtEmpresas,
+    OrdenTrabajo,
+    Role,
+    TecnicoSupervisor,
+    User,
+    UserEmpresa,
+    UserRole,
+)
+from src.utils.decorators import conditional_on_tables, require_basic_auth
+from src.utils.error_handlers import register_json_error_handlers
+from src.utils.image_utils import send_image_file, serve_default_placeholder_image
+from src.utils.json_response import ojsonify
+
+# Page size bounds for the paginated historia OT empresas listing
+HISTORIA_DEFAULT_PER_PAGE = 1000
+HISTORIA_MAX_PER_PAGE = 5000
 
 # Create API blueprint with same /toa prefix to maintain URL compatibility
 toa_api_bp = Blueprint("toa_api", __name__)
+register_json_error_handlers(toa_api_bp)
 
 
 @toa_api_bp.route("/toa/get_empresas_externas", methods=["GET"])
 @require_basic_auth()
+@conditional_on_tables(EmpresasExternasToa)
 def get_empresas_externas_toa():
     """
     Get all EmpresasExternasToa records.
@@ -30,15 +48,13 @@ def get_empresas_externas_toa():
     Returns:
         JSON list of companies with nombre, nombre_toa, and rut fields
     """
-    try:
-        result = services.empresas_externas_use_case.get_empresas_externas_toa_all()
-        return jsonify(result), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    result = services.empresas_externas_use_case.get_empresas_externas_toa_all()
+    return jsonify(result), 200
 
 
 @toa_api_bp.route("/toa/comentarios", methods=["GET"])
 @require_basic_auth()
+@conditional_on_tables(Comentario)
 def get_all_comentarios():
     """
     Get all comentarios from the system.
@@ -51,21 +67,14 @@ def get_all_comentarios():
         - comentarios: List of all comentarios with full details
         - total: Total number of comentarios
     """
-    try:
-        # Get all comentarios through use case (no token needed, already validated)
-        result = services.comentarios_use_case.get_all_comentarios()
-        return jsonify(result), 200
-
-    except RuntimeError as e:
-        # Database or system errors
-        return jsonify({"error": str(e)}), 500
-    except Exception as e:
-        # Unexpected errors
-        return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
+    # Get all comentarios through use case (no token needed, already validated)
+    result = services.comentarios_use_case.get_all_comentarios()
+    return ojsonify(result)
 
 
 @toa_api_bp.route("/toa/ordenes_trabajo", methods=["GET"])
 @require_basic_auth()
+@conditional_on_tables(OrdenTrabajo)
 def get_all_ordenes_trabajo():
     """
     Get all ordenes de trabajo from the system.
@@ -78,21 +87,14 @@ def get_all_ordenes_trabajo():
         - ordenes_trabajo: List of all records with details
         - total: Total number of records
     """
-    try:
-        # Get all ordenes de trabajo through use case (no token needed, already validated)
-        result = services.orden_trabajo_use_case.get_all_ordenes_trabajo()
-        return jsonify(result), 200
-
-    except RuntimeError as e:
-        # Database or system errors
-        return jsonify({"error": str(e)}), 500
-    except Exception as e:
-        # Unexpected errors
-        return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
+    # Get all ordenes de trabajo through use case (no token needed, already validated)
+    result = services.orden_trabajo_use_case.get_all_ordenes_trabajo()
+    return ojsonify(result)
 
 
 @toa_api_bp.route("/toa/users", methods=["GET"])
 @require_basic_auth()
+@conditional_on_tables(User, UserRole, Role, UserEmpresa, EmpresasExternasToa)
 def get_all_users():
     """
     Get all users from the system.
@@ -105,21 +107,9 @@ def get_all_users():
         - users: List of all active users with details
         - total: Total number of users
     """
-    try:
-        # Get all users through use case (no token needed, already validated)
-        result = services.user_use_case.get_all_users_data()
-
-        # Rename the key to match the pattern of other endpoints
-        result["users"] = result.pop("users")  # Keep the same key
-
-        return jsonify(result), 200
-
-    except RuntimeError as e:
-        # Database or system errors
-        return jsonify({"error": str(e)}), 500
-    except Exception as e:
-        # Unexpected errors
-        return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
+    # Get all users through use case (no token needed, already validated)
+    result = services.user_use_case.get_all_users_data()
+    return ojsonify(result)
 
 
 @toa_api_bp.route("/toa/powerbi/comentarios/imagen/<int:comentario_id>")
@@ -139,15 +129,13 @@ def serve_comentario_image_powerbi(comentario_id):
             return serve_default_placeholder_image()
 
         # Build the full image path
-        from src.constants import ROOT_PATH
-
-        if os.path.isabs(comentario.imagen_path):
-            full_image_path = comentario.imagen_path
-        else:
-            full_image_path = os.path.join(ROOT_PATH, comentario.imagen_path)
+        full_image_path = resolve_project_path(comentario.imagen_path)
 
-        # If image file doesn't exist, return placeholder
-        if not os.path.exists(full_image_path):
+        # If image file doesn't exist, return placeholder. send_image_file
+        # raises for it, also when nginx would serve the file (X-Accel)
+        try:
+            response = send_image_file(full_image_path, check_exists=True)
+        except FileNotFoundError:
             current_app.logger.warning(
                 f"PowerBI: Image file not found for comentario {comentario_id}: {full_image_path}"
             )
@@ -158,7 +146,7 @@ def serve_comentario_image_powerbi(comentario_id):
             f"PowerBI: Serving image for comentario {comentario_id}"
         )
 
-        return send_file(full_image_path)
+        return response
 
     except Exception as e:
         # Log error and return placeholder instead of 404
@@ -170,6 +158,7 @@ def serve_comentario_image_powerbi(comentario_id):
 
 @toa_api_bp.route("/toa/tecnicos_supervisores", methods=["GET"])
 @require_basic_auth()
+@conditional_on_tables(TecnicoSupervisor)
 def get_all_tecnicos_supervisores():
     """
     Get all tecnicos supervisores from the system.
@@ -182,21 +171,14 @@ def get_all_tecnicos_supervisores():
         - tecnicos_supervisores: List of all tecnicos with full details
         - total: Total number of tecnicos supervisores
     """
-    try:
-        # Get all tecnicos supervisores through use case (no token needed, already validated)
-        result = services.tecnico_supervisor_use_case.get_all_tecnicos_supervisores()
-        return jsonify(result), 200
-
-    except RuntimeError as e:
-        # Database or system errors
-        return jsonify({"error": str(e)}), 500
-    except Exception as e:
-        # Unexpected errors
-        return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
+    # Get all tecnicos supervisores through use case (no token needed, already validated)
+    result = services.tecnico_supervisor_use_case.get_all_tecnicos_supervisores()
+    return ojsonify(result)
 
 
 @toa_api_bp.route("/toa/historia_ot_empresas", methods=["GET"])
 @require_basic_auth()
+@conditional_on_tables(HistoriaOtEmpresas)
 def get_all_historia_ot_empresas():
     """
     Get all historia OT empresas from the system.
@@ -204,19 +186,25 @@ def get_all_historia_ot_empresas():
     Headers:
         Token: Authentication token (configured via API_TOKEN env var)
 
+    Query params:
+        page: Optional page number; when given only that page is returned
+        per_page: Records per page (1-5000, default 1000)
+
     Returns:
         JSON response with all historia OT empresas data including:
         - historia_ot_empresas: List of all records with full details
         - total: Total number of records
+        - pagination: Page data (only when page is given)
     """
-    try:
-        # Get all historia OT empresas through use case (no token needed, already validated)
-        result = services.historia_iniciados_use_case.get_all_historia_ot_empresas()
-        return jsonify(result), 200
+    page = request.args.get("page", type=int)
+    if page is not None:
+        per_page = request.args.get("per_page", HISTORIA_DEFAULT_PER_PAGE, type=int)
+        per_page = min(max(per_page, 1), HISTORIA_MAX_PER_PAGE)
+        result = services.historia_iniciados_use_case.get_historia_ot_empresas_page(
+            max(page, 1), per_page, data_version=g.tables_fingerprint
+        )
+        return ojsonify(result)
 
-    except RuntimeError as e:
-        # Database or system errors
-        return jsonify({"error": str(e)}), 500
-    except Exception as e:
-        # Unexpected errors
-        return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
+    # Get all historia OT empresas through use case (no token needed, already validated)
+    result = services.historia_iniciados_use_case.get_all_historia_ot_empresas()
+    return ojsonify(result)
@@ -1,27 +1,38 @@
 import os
+import shutil
+import tempfile
+from contextlib import ExitStack, closing
 
 from flask import (
     Blueprint,
     abort,
     current_app,
     flash,
+    g,
     jsonify,
     redirect,
     render_template,
     request,
-    send_file,
     url_for,
 )
 from flask_login import current_user, login_required
+from werkzeug.datastructures import FileStorage
 
 from src.app.extensions import services
+from src.app.request import spool_uploads_in_memory
+from src.constants import resolve_project_path
+from src.utils.background_jobs import start_upload_job
 from src.utils.decorators import (
     dev_only,
+    require_session_cookie,
     require_token,
     require_token_and_json,
 )
+from src.utils.error_handlers import register_json_error_handlers
+from src.utils.image_utils import send_image_file
 
 toa_bp = Blueprint("toa", __name__, url_prefix="/toa")
+register_json_error_handlers(toa_bp)
 
 # Route Constants
 MAIN_WELCOME_ROUTE = "main.welcome"
@@ -31,6 +42,15 @@ TOA_LIST_TECNICOS_ROUTE = "toa.list_tecnicos"
 TOA_MANAGE_COMENTARIOS_ROUTE = "toa.manage_comentarios"
 TOA_UPLOAD_TECNICOS_EXCEL_ROUTE = "toa.upload_tecnicos_excel"
 
+# Chunk size used when spooling raw request bodies to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Content types parsed by Werkzeug's form parser; anything else is a raw body
+FORM_MIMETYPES = frozenset({"multipart/form-data", "application/x-www-form-urlencoded"})
+# Accepted upload file extensions (compared lowercased)
+JSON_EXTENSIONS = frozenset({".json"})
+# Bytes read from a multipart file to check that it holds a JSON array
+JSON_SNIFF_SIZE = 1024
+
 
 def _handle_route_error(e, error_route=MAIN_WELCOME_ROUTE, route_name="route"):
     """
@@ -53,13 +73,99 @@ def _handle_route_error(e, error_route=MAIN_WELCOME_ROUTE, route_name="route"):
         return redirect(url_for(error_route))
 
 
+class _OrdenTrabajoView:
+    """Lightweight read-only view of an orden de trabajo for templates."""
+
+    __slots__ = ("id", "codigo", "id_empresa")
+
+    def __init__(self, codigo: str, id: int = None, id_empresa: int = None):
+        self.id = id
+        self.codigo = codigo
+        self.id_empresa = id_empresa
+
+
+def _current_user_is_admin() -> bool:
+    """Whether the logged in user is the dev user or has the admin role (memoized per request)."""
+    if "is_admin" not in g:
+        g.is_admin = current_user.username == "dev" or current_user.has_roles(["admin"])
+    return g.is_admin
+
+
+def _current_user_empresa_ids() -> list[int]:
+    """IDs of the empresas assigned to the logged in user (memoized per request)."""
+    if "user_empresa_ids" not in g:
+        g.user_empresa_ids = current_user.get_empresa_ids()
+    return g.user_empresa_ids
+
+
 @toa_bp.route("/healthcheck")
 def healthcheck():
     return jsonify({"status": "ok"})
 
 
+def _spool_request_body(head=b""):
+    """
+    Copy the raw request body to a temporary file in fixed-size chunks.
+
+    The body is never held in memory as a whole, so large JSON uploads
+    only cost UPLOAD_CHUNK_SIZE bytes of RAM. The temporary file is
+    removed as soon as it is closed.
+
+    Args:
+        head: Bytes already read from the start of the body
+
+    Returns:
+        Temporary file positioned at the start of the uploaded content
+    """
+    with ExitStack() as stack:
+        # Closed (and removed) if reading the body fails half-way
+        tmp = stack.enter_context(tempfile.TemporaryFile())
+        tmp.write(head)
+        shutil.copyfileobj(request.stream, tmp, length=UPLOAD_CHUNK_SIZE)
+        tmp.seek(0)
+        stack.pop_all()
+    return tmp
+
+
+def _is_json_filename(filename):
+    """Whether the file name has a .json extension, in any case"""
+    return os.path.splitext(filename)[1].lower() in JSON_EXTENSIONS
+
+
+def _starts_json_array(head):
+    """Whether the first bytes of an upload open a JSON array"""
+    return head.lstrip()[:1] == b"["
+
+
 def _validate_file_upload():
-    """Common validation logic for file uploads"""
+    """
+    Common validation logic for file uploads.
+
+    Accepts either a raw body (e.g. ``application/json`` or
+    ``application/octet-stream``), which is streamed to disk, or the legacy
+    multipart form with a ``file`` field. Raw bodies may declare their file
+    name with the ``X-Filename`` header.
+
+    Bodies over MAX_CONTENT_LENGTH are refused with 413 before being read,
+    and content that does not open a JSON array is rejected from its first
+    bytes instead of being stored.
+    """
+    if request.mimetype not in FORM_MIMETYPES:
+        filename = request.headers.get("X-Filename")
+        if filename is not None and not _is_json_filename(filename):
+            return jsonify({"error": "El archivo debe ser un archivo JSON"}), 400
+
+        if request.content_length == 0:
+            return jsonify({"error": "No se proporcionó archivo"}), 400
+
+        head = request.stream.read(UPLOAD_CHUNK_SIZE)
+        if not head:
+            return jsonify({"error": "No se proporcionó archivo"}), 400
+        if not _starts_json_array(head):
+            return jsonify({"error": "El archivo debe contener una lista JSON"}), 400
+
+        return _spool_request_body(head), None
+
     if "file" not in request.files:
         return jsonify({"error": "No se proporcionó archivo"}), 400
 
@@ -67,51 +173,129 @@ def _validate_file_upload():
     if file.filename == "":
         return jsonify({"error": "No se seleccionó archivo"}), 400
 
-    if not file.filename.endswith(".json"):
+    if not _is_json_filename(file.filename):
         return jsonify({"error": "El archivo debe ser un archivo JSON"}), 400
 
+    head = file.stream.read(JSON_SNIFF_SIZE)
+    file.stream.seek(0)
+    if not _starts_json_array(head):
+        return jsonify({"error": "El archivo debe contener una lista JSON"}), 400
+
     return file, None
 
 
-def _process_zone_file_upload(zone_method_name):
-    """Common logic for processing zone file uploads"""
+def _wants_async():
+    """Uploads sent with ``?async=1`` are processed in the background"""
+    return request.args.get("async", "").lower() in ("1", "true", "yes")
+
+
+def _detach_upload(file):
+    """
+    Give a background job its own copy of a multipart upload.
+
+    Werkzeug closes the request files when the request ends, so the form
+    file is copied to a temporary file first. Spooled raw bodies already
+    belong to the caller and are returned as is.
+    """
+    if not isinstance(file, FileStorage):
+        return file
+
+    with closing(file), ExitStack() as stack:
+        # Closed (and removed) if the copy fails half-way
+        tmp = stack.enter_context(tempfile.TemporaryFile())
+        shutil.copyfileobj(file.stream, tmp, length=UPLOAD_CHUNK_SIZE)
+        tmp.seek(0)
+        stack.pop_all()
+    return tmp
+
+
+def _accept_upload_job(kind, process, file):
+    """Queue the upload and answer 202 with the URL to poll for its status"""
+    upload = _detach_upload(file)
     try:
-        file_or_error = _validate_file_upload()
-        if len(file_or_error) == 2 and file_or_error[1] is not None:
-            return file_or_error  # Return error response
+        job = start_upload_job(kind, process, upload)
+    except Exception:
+        # The job never took ownership of the file
+        upload.close()
+        raise
+    return (
+        jsonify(
+            {
+                "job_id": job.uuid,
+                "status": job.status,
+                "status_url": url_for("toa.get_upload_job", job_uuid=job.uuid),
+            }
+        ),
+        202,
+    )
+
 
-        file = file_or_error[0]
+def _process_zone_file_upload(zone):
+    """Common logic for processing zone file uploads (zone is a canonical identifier)"""
+    file_or_error = _validate_file_upload()
+    if len(file_or_error) == 2 and file_or_error[1] is not None:
+        return file_or_error  # Return error response
 
-        # Get the appropriate method from the initialized use case
-        zone_method = getattr(services.historia_iniciados_use_case, zone_method_name)
+    zone_method = _get_zone_dispatch()[zone]
+    if _wants_async():
+        return _accept_upload_job(f"historia_{zone}", zone_method, file_or_error[0])
+
+    with closing(file_or_error[0]) as file:
         ot_no_ingresadas = zone_method(file)
 
-        return (
-            jsonify(
-                {
-                    "message": "File uploaded successfully",
-                    "No ingresadas": ot_no_ingresadas,
-                }
-            ),
-            200,
-        )
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    return (
+        jsonify(
+            {
+                "message": "File uploaded successfully",
+                "No ingresadas": ot_no_ingresadas,
+            }
+        ),
+        200,
+    )
 
 
-# Zone mapping for URL parameter to use case method
-ZONE_MAPPING = {
+# Canonical zone identifier -> use case method
+ZONE_METHODS = {
     "south": "set_data_zona_sur",
     "north": "set_data_zona_norte",
     "center": "set_data_zona_centro",
     "metro": "set_data_zona_metropolitana",
-    # Also support Spanish names for backward compatibility
-    "sur": "set_data_zona_sur",
-    "norte": "set_data_zona_norte",
-    "centro": "set_data_zona_centro",
-    "metropolitana": "set_data_zona_metropolitana",
 }
 
+# Also support Spanish names for backward compatibility
+ZONE_ALIASES = {
+    "sur": "south",
+    "norte": "north",
+    "centro": "center",
+    "metropolitana": "metro",
+}
+
+VALID_ZONES = frozenset(ZONE_METHODS) | frozenset(ZONE_ALIASES)
+
+# Error message with the accepted zones baked in; only the zone is formatted
+_INVALID_ZONE_MSG = "Zona inválida '{}'. Las zonas válidas son: " + ", ".join(
+    [*ZONE_METHODS, *ZONE_ALIASES]
+)
+
+# Zone -> bound use case method, built on first use
+_ZONE_DISPATCH = None
+
+
+def _get_zone_dispatch():
+    """
+    Bind the zone upload methods of the use case singleton once per process.
+
+    Built lazily so it does not depend on the services being initialized
+    before the blueprint is registered.
+    """
+    global _ZONE_DISPATCH
+    if _ZONE_DISPATCH is None:
+        use_case = services.historia_iniciados_use_case
+        _ZONE_DISPATCH = {
+            zone: getattr(use_case, method) for zone, method in ZONE_METHODS.items()
+        }
+    return _ZONE_DISPATCH
+
 
 @toa_bp.route("/set_data_toa_historia/<zone>", methods=["POST"])
 def set_data_toa_historia_zone(zone):
@@ -122,60 +306,71 @@ def set_data_toa_historia_zone(zone):
         zone: Zone identifier (south, north, center, metro, sur, norte, centro, metropolitana)
     """
     # Validate zone parameter
-    if zone not in ZONE_MAPPING:
-        valid_zones = list(ZONE_MAPPING.keys())
-        return (
-            jsonify(
-                {
-                    "error": f"Zona inválida '{zone}'. Las zonas válidas son: {', '.join(valid_zones)}"
-                }
-            ),
-            400,
-        )
+    if zone not in VALID_ZONES:
+        return jsonify({"error": _INVALID_ZONE_MSG.format(zone)}), 400
 
-    # Get the corresponding use case method name
-    zone_method_name = ZONE_MAPPING[zone]
-    return _process_zone_file_upload(zone_method_name)
+    return _process_zone_file_upload(ZONE_ALIASES.get(zone, zone))
 
 
-# Backward compatibility routes - these will redirect to the new parameterized route
-@toa_bp.route("/set_data_toa_historia_south_zone", methods=["POST"])
-def set_data_toa_historia_south_zone():
-    """Backward compatibility route"""
-    return set_data_toa_historia_zone("south")
-
-
-@toa_bp.route("/set_data_toa_historia_north_zone", methods=["POST"])
-def set_data_toa_historia_north_zone():
-    """Backward compatibility route"""
-    return set_data_toa_historia_zone("north")
+# Backward compatibility routes: served directly by the parameterized view,
+# keeping their original URLs and endpoint names
+LEGACY_ZONE_ROUTES = {
+    "south": "set_data_toa_historia_south_zone",
+    "north": "set_data_toa_historia_north_zone",
+    "center": "set_data_toa_historia_center_zone",
+    "metro": "set_data_toa_historia_metropolitana_zone",
+}
 
+for _zone, _endpoint in LEGACY_ZONE_ROUTES.items():
+    toa_bp.add_url_rule(
+        f"/set_data_toa_historia_{_zone}_zone",
+        endpoint=_endpoint,
+        view_func=set_data_toa_historia_zone,
+        defaults={"zone": _zone},
+        methods=["POST"],
+    )
 
-@toa_bp.route("/set_data_toa_historia_center_zone", methods=["POST"])
-def set_data_toa_historia_center_zone():
-    """Backward compatibility route"""
-    return set_data_toa_historia_zone("center")
 
+@toa_bp.route("/set_empresas_externas_toa", methods=["POST"])
+def set_empresas_externas_toa():
+    file_or_error = _validate_file_upload()
+    if len(file_or_error) == 2 and file_or_error[1] is not None:
+        return file_or_error  # Return error response
 
-@toa_bp.route("/set_data_toa_historia_metro_zone", methods=["POST"])
-def set_data_toa_historia_metropolitana_zone():
-    """Backward compatibility route"""
-    return set_data_toa_historia_zone("metro")
+    process = services.empresas_externas_use_case.set_empresas_externas_toa
+    if _wants_async():
+        return _accept_upload_job("empresas_externas", process, file_or_error[0])
 
+    with closing(file_or_error[0]) as file:
+        process(file)
+    return jsonify({"message": "File uploaded successfully"}), 200
 
-@toa_bp.route("/set_empresas_externas_toa", methods=["POST"])
-def set_empresas_externas_toa():
-    try:
-        file_or_error = _validate_file_upload()
-        if len(file_or_error) == 2 and file_or_error[1] is not None:
-            return file_or_error  # Return error response
 
-        file = file_or_error[0]
+@toa_bp.route("/upload_jobs/<uuid:job_uuid>", methods=["GET"])
+def get_upload_job(job_uuid):
+    """
+    Status of an upload sent with ``?async=1``.
 
-        services.empresas_externas_use_case.set_empresas_externas_toa(file)
-        return jsonify({"message": "File uploaded successfully"}), 200
-    except Exception as e:
-        return jsonify({"error": str(e)}), 500
+    Returns:
+        JSON with the job status (pending, running, done, error), its result
+        once done (e.g. the OTs that were not ingested) or the error message
+    """
+    job = services.upload_job.get_job_by_uuid(job_uuid)
+    if not job:
+        return jsonify({"error": "Carga no encontrada"}), 404
+
+    return (
+        jsonify(
+            {
+                "job_id": job.uuid,
+                "kind": job.kind,
+                "status": job.status,
+                "result": job.result,
+                "error": job.error,
+            }
+        ),
+        200,
+    )
 
 
 @toa_bp.route("/add_ordenes_trabajo", methods=["POST"])
@@ -197,26 +392,17 @@ def add_ordenes_trabajo():
     Returns:
         JSON response with operation results
     """
-    try:
-        # Get JSON data (guaranteed to exist due to decorator)
-        ordenes_data = request.get_json()
-
-        # Process the request through use case (no token needed, already validated)
-        result = services.orden_trabajo_use_case.add_ordenes_trabajo(ordenes_data)
-        return jsonify(result), 201
+    # Get JSON data (guaranteed to exist due to decorator)
+    ordenes_data = request.get_json()
 
-    except ValueError as e:
-        # Validation errors (data format, business rules, etc.)
-        return jsonify({"error": str(e)}), 400
-    except RuntimeError as e:
-        # Database or system errors
-        return jsonify({"error": str(e)}), 500
-    except Exception as e:
-        # Unexpected errors
-        return jsonify({"error": f"Error inesperado: {str(e)}"}), 500
+    # Process the request through use case (no token needed, already validated).
+    # Validation and database errors are turned into JSON by the blueprint handlers.
+    result = services.orden_trabajo_use_case.add_ordenes_trabajo(ordenes_data)
+    return jsonify(result), 201
 
 
 @toa_bp.route("/comentarios/<codigo_orden_trabajo>", methods=["GET", "POST"])
+@require_session_cookie()
 @login_required
 def manage_comentarios(codigo_orden_trabajo):
     """
@@ -263,7 +449,7 @@ def manage_comentarios(codigo_orden_trabajo):
             )
 
             # Convert data for template
-            orden_trabajo = type("OrdenTrabajo", (), data["orden_trabajo"])
+            orden_trabajo = _OrdenTrabajoView(**data["orden_trabajo"])
 
             return render_template(
                 "add_comentario.html",
@@ -279,9 +465,7 @@ def manage_comentarios(codigo_orden_trabajo):
             return render_template(
                 "add_comentario.html",
                 username=current_user.username,
-                orden_trabajo=type(
-                    "OrdenTrabajo", (), {"codigo": codigo_orden_trabajo}
-                ),
+                orden_trabajo=_OrdenTrabajoView(codigo=codigo_orden_trabajo),
                 comentarios_count=0,
                 error_state=True,
             )
@@ -299,37 +483,26 @@ def manage_tecnicos():
 
     try:
         if request.method == "POST":
-            # Get form data - expect multiple tecnicos
-            tecnicos_data = []
-
-            # Parse form data to get multiple tecnicos
-            form_data = request.form.to_dict(flat=False)
-
-            # Count how many tecnicos were submitted
-            max_index = 0
-            for key in form_data:
-                if key.startswith("nombre_tecnico_"):
-                    index = int(key.split("_")[-1])
-                    max_index = max(max_index, index)
-
-            # Collect data for each tecnico
-            for i in range(max_index + 1):
-                nombre_tecnico = request.form.get(f"nombre_tecnico_{i}", "").strip()
-                rut_tecnico = request.form.get(f"rut_tecnico_{i}", "").strip()
-
-                # Only include if both fields have data
-                if nombre_tecnico and rut_tecnico:
-                    nombre_supervisor = request.form.get(
-                        "nombre_supervisor", ""
-                    ).strip()
-
-                    tecnicos_data.append(
-                        {
-                            "nombre_tecnico": nombre_tecnico,
-                            "rut_tecnico": rut_tecnico,
-                            "nombre_supervisor": nombre_supervisor,
-                        }
-                    )
+            # Each técnico row posts one nombre_tecnico and one rut_tecnico,
+            # so both lists are in row order
+            nombres = request.form.getlist("nombre_tecnico")
+            ruts = request.form.getlist("rut_tecnico")
+            nombre_supervisor = request.form.get("nombre_supervisor", "").strip()
+
+            if len(nombres) != len(ruts):
+                flash("Cada técnico debe tener nombre y RUT.", "error")
+                return redirect(url_for(TOA_MANAGE_TECNICOS_ROUTE))
+
+            # Only include tecnicos where both fields have data
+            tecnicos_data = [
+                {
+                    "nombre_tecnico": nombre.strip(),
+                    "rut_tecnico": rut.strip(),
+                    "nombre_supervisor": nombre_supervisor,
+                }
+                for nombre, rut in zip(nombres, ruts, strict=True)
+                if nombre.strip() and rut.strip()
+            ]
 
             if not tecnicos_data:
                 flash("Debe agregar al menos un técnico.", "error")
@@ -382,6 +555,7 @@ def list_tecnicos():
 
 
 @toa_bp.route("/tecnicos/upload", methods=["GET", "POST"])
+@spool_uploads_in_memory
 @dev_only()
 def upload_tecnicos_excel():
     """Route for uploading Excel files with technician data."""
@@ -437,8 +611,8 @@ def upload_tecnicos_excel():
 def serve_comentario_image(comentario_id):
     """Serve image for a specific comentario."""
     try:
-        # Get the comentario
-        comentario = services.comentarios.get_comentario_by_id(comentario_id)
+        # Get the comentario, with the orden needed for the access check
+        comentario = services.comentarios.get_comentario_with_orden_by_id(comentario_id)
         if not comentario or not comentario.imagen_path:
             abort(404)
 
@@ -447,11 +621,11 @@ def serve_comentario_image(comentario_id):
             abort(404)
 
         # Check if user is admin (dev user or has admin role)
-        is_admin = current_user.username == "dev" or current_user.has_roles(["admin"])
+        is_admin = _current_user_is_admin()
 
         # Admin users have access to all images, regular users need validation
         if not is_admin:
-            user_empresa_ids = [empresa.id for empresa in current_user.empresas]
+            user_empresa_ids = _current_user_empresa_ids()
 
             # Additional security: ensure user has at least one empresa assigned
             if not user_empresa_ids:
@@ -471,21 +645,12 @@ def serve_comentario_image(comentario_id):
                 )
                 abort(403)  # Forbidden
 
-        # Properly join the image path with the ROOT_PATH
-        from src.constants import ROOT_PATH
+        # Absolute paths are used as is, relative ones are joined with ROOT_PATH
+        full_image_path = resolve_project_path(comentario.imagen_path)
 
-        if os.path.isabs(comentario.imagen_path):
-            # If it's already an absolute path, use it as is
-            full_image_path = comentario.imagen_path
-        else:
-            # Join relative path with ROOT_PATH
-            full_image_path = os.path.join(ROOT_PATH, comentario.imagen_path)
-
-        # Check if image file exists
-        if not os.path.exists(full_image_path):
-            abort(404)
-
-        return send_file(full_image_path)
+        # No separate existence check: a missing file raises FileNotFoundError
+        # from send_image_file, which ends in the 404 below
+        return send_image_file(full_image_path)
 
     except Exception:
         abort(404)
@@ -499,8 +664,9 @@ def list_ordenes_comentarios():
     Users can search and select ordenes to view their comentarios.
     """
     try:
-        # Get search parameters
-        page = request.args.get("page", 1, type=int)
+        # Get search parameters; after/before are keyset pagination cursors
+        after = request.args.get("after")
+        before = request.args.get("before")
         search_codigo = request.args.get("codigo", "").strip()
         search_fecha_inicio = request.args.get("fecha_inicio", "").strip()
         search_fecha_fin = request.args.get("fecha_fin", "").strip()
@@ -512,13 +678,14 @@ def list_ordenes_comentarios():
         search_fecha_fin = search_fecha_fin if search_fecha_fin else None
 
         # Check if user is admin (dev user or has admin role)
-        is_admin = current_user.username == "dev" or current_user.has_roles(["admin"])
+        is_admin = _current_user_is_admin()
 
         if is_admin:
             # Admin users see ALL ordenes and can filter by empresa
             result = services.orden_trabajo.get_ordenes_trabajo_admin(
-                page=page,
                 per_page=10,
+                after=after,
+                before=before,
                 search_codigo=search_codigo,
                 search_fecha_inicio=search_fecha_inicio,
                 search_fecha_fin=search_fecha_fin,
@@ -528,7 +695,7 @@ def list_ordenes_comentarios():
             all_empresas = services.user.get_all_empresas()
         else:
             # Regular users see only their empresa's ordenes
-            user_empresa_ids = [empresa.id for empresa in current_user.empresas]
+            user_empresa_ids = _current_user_empresa_ids()
 
             # Security check: ensure user has empresa assignments
             if not user_empresa_ids:
@@ -537,27 +704,28 @@ def list_ordenes_comentarios():
                     f"ordenes list but has no empresa assignments"
                 )
                 # Return empty result for users with no empresa assignments
-                result = type(
-                    "obj",
-                    (object,),
-                    {
-                        "items": [],
-                        "page": 1,
-                        "pages": 0,
+                result = {
+                    "ordenes": [],
+                    "pagination": {
                         "per_page": 10,
-                        "total": 0,
-                        "prev_num": None,
-                        "next_num": None,
                         "has_prev": False,
                         "has_next": False,
+                        "prev_cursor": None,
+                        "next_cursor": None,
+                    },
+                    "search_filters": {
+                        "codigo": search_codigo,
+                        "fecha_inicio": search_fecha_inicio,
+                        "fecha_fin": search_fecha_fin,
                     },
-                )()
+                }
                 all_empresas = None
             else:
                 result = services.orden_trabajo.get_ordenes_trabajo_by_user_empresas(
                     user_empresa_ids=user_empresa_ids,
-                    page=page,
                     per_page=10,
+                    after=after,
+                    before=before,
                     search_codigo=search_codigo,
                     search_fecha_inicio=search_fecha_inicio,
                     search_fecha_fin=search_fecha_fin,
@@ -586,24 +754,11 @@ def view_orden_comentarios(codigo):
     Shows comentarios with their photos if available.
     """
     try:
-        # Get orden de trabajo and validate user access
-        orden_trabajo = services.comentarios_use_case.get_orden_trabajo_by_codigo(
-            codigo
+        # Get orden de trabajo with the user access check in the same query
+        orden_trabajo = services.comentarios_use_case.get_orden_trabajo_for_user(
+            current_user, codigo
         )
-
-        # Check if user is admin (dev user or has admin role)
-        is_admin = current_user.username == "dev" or current_user.has_roles(["admin"])
-
         if not orden_trabajo:
-            raise ValueError(f"Orden de trabajo '{codigo}' no encontrada")
-
-        # Admin users have access to all ordenes, regular users need validation
-        if (
-            not is_admin
-            and not services.comentarios_use_case.validate_user_access_to_orden(
-                current_user, orden_trabajo
-            )
-        ):
             raise ValueError(
                 f"Orden de trabajo '{codigo}' no encontrada o el usuario no tiene acceso"
             )
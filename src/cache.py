@@ -0,0 +1,58 @@
+import hashlib
+import uuid
+from collections.abc import Callable
+from functools import wraps
+
+from flask_caching import Cache
+
+# Query-result cache, configured from the CACHE_* settings in Config
+cache = Cache()
+
+
+def _namespace_version_key(namespace: str) -> str:
+    return f"{namespace}:version"
+
+
+def invalidate_namespace(namespace: str) -> None:
+    """
+    Drop every result cached under a namespace.
+
+    The namespace version is replaced, so old entries are no longer reachable
+    and simply expire with their TTL; no key scan is needed (also on Redis).
+    """
+    cache.set(_namespace_version_key(namespace), uuid.uuid4().hex, timeout=0)
+
+
+def cached_in_namespace(namespace: str, timeout: int, ignore_self: bool = False):
+    """
+    Cache a function's result by its arguments under an invalidatable namespace.
+
+    Args:
+        namespace: Group of results invalidated together (invalidate_namespace)
+        timeout: Seconds a result is served from the cache
+        ignore_self: Leave the first argument out of the key (methods of the
+            application singletons, whose repr differs between processes)
+    """
+
+    def decorator(fn: Callable) -> Callable:
+        name = f"{fn.__module__}.{fn.__qualname__}"
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            key_args = args[1:] if ignore_self else args
+            digest = hashlib.blake2b(
+                f"{name}:{key_args!r}:{sorted(kwargs.items())!r}".encode(),
+                digest_size=16,
+            ).hexdigest()
+            version = cache.get(_namespace_version_key(namespace)) or "0"
+            key = f"{namespace}:{version}:{digest}"
+
+            result = cache.get(key)
+            if result is None:
+                result = fn(*args, **kwargs)
+                cache.set(key, result, timeout=timeout)
+            return result
+
+        return wrapper
+
+    return decorator
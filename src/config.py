@@ -6,12 +6,96 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _engine_options(database_uri: str) -> dict:
+    """
+    SQLAlchemy engine options for the configured database driver.
+
+    Server databases get a connection pool per process, checked with a ping
+    on checkout and recycled before the server or a proxy drops idle
+    connections. Every gunicorn worker has its own pool, so the server sees up
+    to workers * (pool_size + max_overflow) connections: 5 + 5 per worker keeps
+    an 8-core host (8 workers) at 80, under PostgreSQL's default
+    max_connections of 100. A request waits at most pool_timeout seconds for
+    a free connection before failing instead of hanging. SQLite does not use
+    a QueuePool, so it keeps the defaults.
+
+    With psycopg2, executemany INSERTs are sent as multi-row VALUES pages and
+    other executemany statements (bulk UPDATEs) through execute_batch, instead
+    of one round-trip per parameter set. Other drivers reject these arguments.
+
+    psycopg 3 turns a query into a server-side prepared statement once it has
+    run prepare_threshold times on a connection, so hot lookups (e.g. an orden
+    by codigo) skip parsing and planning. As in psycopg, 0 prepares every query
+    on its first run; DB_PREPARE_DISABLE turns preparation off, as needed
+    behind a pooler in transaction mode. Only postgresql+psycopg:// URLs use
+    it; the default postgresql:// URL runs on psycopg2, which never prepares.
+    """
+    if database_uri.startswith("sqlite"):
+        return {}
+
+    options = {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "5")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "5")),
+        "pool_pre_ping": True,
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+        "pool_timeout": int(os.getenv("DB_POOL_TIMEOUT", "30")),
+    }
+    if database_uri.startswith(("postgresql://", "postgresql+psycopg2://")):
+        options.update(
+            executemany_mode="values_plus_batch",
+            insertmanyvalues_page_size=1000,
+            executemany_batch_page_size=500,
+        )
+    elif database_uri.startswith("postgresql+psycopg://"):
+        prepare_disabled = os.getenv("DB_PREPARE_DISABLE", "").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+        prepare_threshold = int(os.getenv("DB_PREPARE_THRESHOLD", "2"))
+        options["connect_args"] = {
+            "prepare_threshold": None if prepare_disabled else prepare_threshold,
+        }
+    return options
+
+
 class Config:
     """Base configuration."""
 
     SECRET_KEY = os.getenv("SECRET_KEY", "dev")
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "postgresql://localhost/kepler")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SQLALCHEMY_ENGINE_OPTIONS = _engine_options(SQLALCHEMY_DATABASE_URI)
+
+    # Statements slower than this are logged as warnings (0 disables it)
+    SLOW_QUERY_THRESHOLD_MS = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+
+    # Upper bound for request bodies (JSON zone files can be hundreds of MB)
+    MAX_CONTENT_LENGTH = int(os.getenv("MAX_CONTENT_LENGTH", 512 * 1024 * 1024))
+
+    # Uploaded files up to this size are kept in memory instead of a temp file,
+    # on the routes marked with spool_uploads_in_memory (tecnicos Excel)
+    UPLOAD_SPOOL_MAX_SIZE = int(os.getenv("UPLOAD_SPOOL_MAX_SIZE", 16 * 1024 * 1024))
+
+    # When set (e.g. "/_protected_uploads"), uploaded images are served by nginx
+    # through X-Accel-Redirect. The prefix must be an internal location aliased
+    # to the uploads directory.
+    X_ACCEL_REDIRECT_PREFIX = os.getenv("X_ACCEL_REDIRECT_PREFIX")
+
+    # Threads per worker process that ingest uploads sent with ?async=1
+    UPLOAD_JOB_WORKERS = int(os.getenv("UPLOAD_JOB_WORKERS", "2"))
+
+    # Werkzeug password hash method. Seeding scripts and tests can use a cheap
+    # one (e.g. "pbkdf2:sha256:1000"); existing hashes keep verifying either way.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt")
+
+    # Flask-Caching backend for lookup queries. SimpleCache is per process, so
+    # with several workers an invalidation only reaches the worker that made
+    # the change and the others refresh on expiry; use "RedisCache" with
+    # CACHE_REDIS_URL to share the cache between workers.
+    CACHE_TYPE = os.getenv("CACHE_TYPE", "SimpleCache")
+    CACHE_DEFAULT_TIMEOUT = int(os.getenv("CACHE_DEFAULT_TIMEOUT", "300"))
+    CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL")
 
     # API Configuration
     API_TOKEN = os.getenv("API_TOKEN", "1234567890")
@@ -14,6 +14,9 @@ ROOT_PATH = os.path.dirname(_current_path)
 UPLOAD_PATH = os.path.join(ROOT_PATH, "uploads")
 COMENTARIOS_UPLOAD_PATH = os.path.join(UPLOAD_PATH, "comentarios")
 
+# Date format of the "Fecha" field in TOA exports (e.g. 07/08/2025)
+TOA_DATE_FORMAT = "%d/%m/%Y"
+
 
 def get_upload_path(*subdirs):
     """
@@ -31,6 +34,21 @@ def get_upload_path(*subdirs):
     return os.path.join(UPLOAD_PATH, *subdirs)
 
 
+def resolve_project_path(path):
+    """
+    Resolve a stored file path against the project root.
+
+    Args:
+        path: Absolute path, or path relative to ROOT_PATH
+
+    Returns:
+        str: Absolute path to the file
+    """
+    if os.path.isabs(path):
+        return path
+    return os.path.join(ROOT_PATH, path)
+
+
 def ensure_upload_directory(path):
     """
     Ensure that an upload directory exists.
@@ -1,19 +1,13 @@
-from flask_migrate import Migrate
-from flask_sqlalchemy import SQLAlchemy
-
-db = SQLAlchemy(session_options={"autocommit": False})
-migrate = Migrate()
-
-# Import base models first to avoid circular imports
-from src.models._base import BaseModel  # noqa: E402,F401
-from src.models.auth.user import Role, User, UserEmpresa, UserRole  # noqa: E402,F401
-from src.models.comentarios import Comentario  # noqa: E402,F401
-
-# Import other models
-from src.models.empresas_externas_toa import EmpresasExternasToa  # noqa: E402,F401
-from src.models.historia_ot_empresas import HistoriaOtEmpresas  # noqa: E402,F401
-from src.models.orden_trabajo import OrdenTrabajo  # noqa: E402,F401
-from src.models.tecnico_supervisor import TecnicoSupervisor  # noqa: E402,F401
+from src.models._db import db, migrate
+from src.models.auth.user import Role, User, UserEmpresa, UserRole
+from src.models.base import BaseModel
+from src.models.comentarios import Comentario
+from src.models.empresas_externas_toa import EmpresasExternasToa
+from src.models.historia_ot_empresas import HistoriaOtEmpresas
+from src.models.orden_trabajo import OrdenTrabajo
+from src.models.table_version import TableVersion
+from src.models.tecnico_supervisor import TecnicoSupervisor
+from src.models.upload_job import UploadJob
 
 __all__ = [
     "db",
@@ -22,7 +16,9 @@ __all__ = [
     "EmpresasExternasToa",
     "HistoriaOtEmpresas",
     "OrdenTrabajo",
+    "TableVersion",
     "TecnicoSupervisor",
+    "UploadJob",
     "User",
     "Role",
     "UserRole",
@@ -1,8 +1,16 @@
+from functools import cached_property
+
+from flask import current_app, has_app_context
 from flask_login import UserMixin
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, bindparam, select
+from sqlalchemy.orm import lazyload
 from werkzeug.security import check_password_hash, generate_password_hash
 
-from src.models import BaseModel, db
+from src.models._db import db
+from src.models.base import BaseModel
+
+# Werkzeug's default; overridden by the PASSWORD_HASH_METHOD setting
+DEFAULT_PASSWORD_HASH_METHOD = "scrypt"
 
 
 class User(UserMixin, BaseModel):
@@ -10,13 +18,13 @@ class User(UserMixin, BaseModel):
     username = db.Column(db.String(64), unique=True, nullable=False)
     password = db.Column(db.String(256), nullable=False)
     roles = db.relationship(
-        "Role", secondary="user_roles", backref=db.backref("users"), lazy="subquery"
+        "Role", secondary="user_roles", back_populates="users", lazy="selectin"
     )
     empresas = db.relationship(
         "EmpresasExternasToa",
         secondary="user_empresas",
-        backref=db.backref("users"),
-        lazy="subquery",
+        back_populates="users",
+        lazy="selectin",
     )
 
     def __init__(
@@ -25,7 +33,13 @@ class User(UserMixin, BaseModel):
         password,
     ):
         self.username = username
-        self.password = generate_password_hash(password)
+        self.set_password(password)
+
+    def set_password(self, password):
+        method = DEFAULT_PASSWORD_HASH_METHOD
+        if has_app_context():
+            method = current_app.config.get("PASSWORD_HASH_METHOD", method)
+        self.password = generate_password_hash(password, method=method)
 
     def verify_password(self, password):
         return check_password_hash(self.password, password)
@@ -35,7 +49,11 @@ class User(UserMixin, BaseModel):
 
     @classmethod
     def get_by_username(cls, username):
-        return cls.active_records().filter_by(username=username).first()
+        return (
+            db.session.execute(_USER_BY_USERNAME, {"username": username})
+            .scalars()
+            .first()
+        )
 
     @classmethod
     def authenticate(cls, username, password) -> bool:
@@ -45,13 +63,43 @@ class User(UserMixin, BaseModel):
     def __repr__(self):
         return f"<User {self.username}>"
 
+    @cached_property
+    def _role_name_set(self) -> frozenset[str]:
+        # Per instance: users are loaded again on every request
+        return frozenset(role.name for role in self.roles)
+
     def has_roles(self, role_list: list) -> bool:
-        return any(role in [x.name for x in self.roles] for role in role_list)
+        return not self._role_name_set.isdisjoint(role_list)
+
+    def get_empresa_ids(self) -> list[int]:
+        """
+        IDs of the empresas assigned to the user.
+
+        Uses the empresas collection when it is already loaded; otherwise
+        reads only the id column instead of hydrating EmpresasExternasToa rows.
+        """
+        if "empresas" in self.__dict__:
+            return [empresa.id for empresa in self.empresas]
+        return list(
+            db.session.execute(
+                select(UserEmpresa.empresa_id).where(UserEmpresa.user_id == self.id)
+            ).scalars()
+        )
+
+    @cached_property
+    def _empresa_id_set(self) -> frozenset[int]:
+        # Per instance, like _role_name_set
+        return frozenset(self.get_empresa_ids())
+
+    def has_empresa(self, empresa_id: int) -> bool:
+        """Whether the empresa is assigned to the user (looked up once per instance)."""
+        return empresa_id in self._empresa_id_set
 
 
 class Role(BaseModel):
     __tablename__ = "roles"
     name = db.Column(db.String(50), unique=True)
+    users = db.relationship("User", secondary="user_roles", back_populates="roles")
 
 
 class UserRole(BaseModel):
@@ -72,3 +120,16 @@ class UserEmpresa(BaseModel):
     __table_args__ = (
         UniqueConstraint("user_id", "empresa_id", name="uq_user_empresa"),
     )
+
+
+# Login lookup, built once instead of a new Query per request. Checking the
+# password only needs the user row, and Flask-Login reloads the user (with its
+# roles) on the next request, so the selectin loads of roles and empresas are
+# skipped here; they still load lazily if something touches them. The "*"
+# wildcard avoids configuring the mappers at import time.
+_USER_BY_USERNAME = (
+    select(User)
+    .options(lazyload("*"))
+    .where(User.username == bindparam("username"), User.active.is_(True))
+    .limit(1)
+)
@@ -0,0 +1,94 @@
+# Base model for all models
+# Contains id, uuid, created_at, updated_at, active
+
+import os
+import time
+import uuid
+from typing import Any
+
+from sqlalchemy import Boolean, DateTime, Uuid, func, inspect
+
+from src.models._db import db
+
+
+def _uuid7_from(timestamp_ms: int, random_bytes: bytes) -> uuid.UUID:
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= int.from_bytes(random_bytes, "big")
+    value = value & ~(0xF << 76) | 0x7 << 76  # version
+    value = value & ~(0x3 << 62) | 0x2 << 62  # RFC 4122 variant
+    return uuid.UUID(int=value)
+
+
+def uuid7() -> uuid.UUID:
+    """
+    Time-ordered UUID (RFC 9562 version 7).
+
+    The first 48 bits are the Unix time in milliseconds, so new rows land at
+    the right edge of the uuid index instead of on random pages.
+    """
+    return _uuid7_from(time.time_ns() // 1_000_000, os.urandom(10))
+
+
+def uuid7_batch(count: int) -> list[uuid.UUID]:
+    """
+    Generate count UUIDv7 values for a bulk insert.
+
+    Reads the clock once and the random part with a single os.urandom call
+    instead of one getrandom syscall per row.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    random_bytes = os.urandom(10 * count)
+    return [
+        _uuid7_from(timestamp_ms, random_bytes[offset : offset + 10])
+        for offset in range(0, 10 * count, 10)
+    ]
+
+
+class ToDictMixin:
+    """Mixin class to add to_dict functionality to SQLAlchemy models."""
+
+    @classmethod
+    def _column_keys(cls) -> tuple[str, ...]:
+        """Mapped column attribute names, resolved once per model class."""
+        keys = cls.__dict__.get("_to_dict_keys")
+        if keys is None:
+            keys = tuple(attr.key for attr in inspect(cls).column_attrs)
+            cls._to_dict_keys = keys
+        return keys
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert SQLAlchemy model instance to dictionary of its columns."""
+        return {key: getattr(self, key) for key in self._column_keys()}
+
+
+class BaseModel(db.Model, ToDictMixin):
+    __abstract__ = True
+    # Read the database-generated timestamps back with RETURNING in the same
+    # INSERT/UPDATE instead of a refresh SELECT on first access
+    __mapper_args__ = {"eager_defaults": True}
+
+    id = db.Column(db.Integer, primary_key=True)
+    # Native UUID on PostgreSQL, CHAR(32) hex on other backends
+    uuid = db.Column(Uuid, unique=True, nullable=False, default=uuid7)
+    # Set by the database clock (America/Santiago, like the app process)
+    created_at = db.Column(DateTime, nullable=False, server_default=func.now())
+    updated_at = db.Column(
+        DateTime,
+        nullable=False,
+        server_default=func.now(),
+        onupdate=func.now(),
+    )
+    active = db.Column(Boolean, nullable=False, default=True, index=True)
+
+    @classmethod
+    def active_records(cls):
+        """Return query filtered to only active records."""
+        return cls.query.filter_by(active=True)
+
+    def soft_delete(self) -> None:
+        """Mark this record as inactive (soft delete); updated_at moves on flush."""
+        self.active = False
+
+    def restore(self) -> None:
+        """Mark this record as active again; updated_at moves on flush."""
+        self.active = True
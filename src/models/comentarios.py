@@ -1,18 +1,38 @@
 from sqlalchemy import String
 
-from src.models import db
-from src.models._base import BaseModel
+from src.models._db import db
+from src.models.base import BaseModel
 
 
 class Comentario(BaseModel):
     __tablename__ = "comentarios"
     comentario = db.Column(String(256), nullable=False)
-    num_ticket = db.Column(String(32), nullable=False)
+    num_ticket = db.Column(String(32), nullable=False, index=True)
     imagen_path = db.Column(String(512), nullable=True)  # Optional image file path
     imagen_original_name = db.Column(String(256), nullable=True)  # Original filename
+    # Indexed by ix_comentarios_orden_created below
     id_orden_trabajo = db.Column(
         db.Integer, db.ForeignKey("ordenes_trabajo.id"), nullable=False
     )
-    id_usuario = db.Column(db.Integer, db.ForeignKey("users.id"), nullable=False)
+    id_usuario = db.Column(
+        db.Integer, db.ForeignKey("users.id"), nullable=False, index=True
+    )
 
     orden_trabajo = db.relationship("OrdenTrabajo", backref="comentarios")
+
+
+# Serves the per-orden listing (WHERE id_orden_trabajo = ? ORDER BY created_at
+# DESC) without a sort step, and every other lookup by id_orden_trabajo
+db.Index(
+    "ix_comentarios_orden_created",
+    Comentario.id_orden_trabajo,
+    Comentario.created_at.desc(),
+)
+
+# Active comentarios count per orden: COUNT(*) WHERE id_orden_trabajo = ? AND
+# active is answered with an index-only scan on this small partial index
+db.Index(
+    "ix_comentarios_orden_active",
+    Comentario.id_orden_trabajo,
+    postgresql_where=db.text("active = true"),
+)
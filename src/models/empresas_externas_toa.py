@@ -2,8 +2,8 @@ from typing import Any
 
 from sqlalchemy import String
 
-from src.models import db
-from src.models._base import BaseModel
+from src.models._db import db
+from src.models.base import BaseModel
 
 
 class EmpresasExternasToa(BaseModel):
@@ -11,6 +11,9 @@ class EmpresasExternasToa(BaseModel):
     nombre = db.Column(String(128), nullable=False)
     nombre_toa = db.Column(String(128), nullable=False)
     rut = db.Column(String(16), nullable=False)
+    users = db.relationship(
+        "User", secondary="user_empresas", back_populates="empresas"
+    )
 
     @classmethod
     def get_empresas_externas_toa_all(cls) -> list[dict[str, Any]]:
@@ -18,9 +21,21 @@ class EmpresasExternasToa(BaseModel):
 
     @classmethod
     def set_empresas_externas_toa(cls, nombre: str, nombre_toa: str, rut: str) -> bool:
+        return cls.set_many([{"nombre": nombre, "nombre_toa": nombre_toa, "rut": rut}])
+
+    @classmethod
+    def set_many(cls, rows: list[dict[str, Any]]) -> bool:
+        """
+        Insert several empresas with one executemany and a single commit.
+
+        Args:
+            rows: Dicts with nombre, nombre_toa and rut
+
+        Returns:
+            True when the rows were committed
+        """
         try:
-            nueva_empresa = cls(nombre=nombre, nombre_toa=nombre_toa, rut=rut)
-            db.session.add(nueva_empresa)
+            db.session.bulk_insert_mappings(cls, rows)
             db.session.commit()
         except Exception as e:
             db.session.rollback()
@@ -1,13 +1,60 @@
+from collections.abc import Iterable, Iterator
+from datetime import date, datetime, timedelta
+from itertools import islice
 from typing import Any
 
-from sqlalchemy import String
+from sqlalchemy import String, insert
 
-from src.models import db
-from src.models._base import BaseModel
+from src.constants import TOA_DATE_FORMAT
+from src.models._db import db
+from src.models.base import BaseModel, uuid7_batch
+
+# Column -> key of the TOA JSON item it is loaded from
+KEY_MAP = {
+    "orden_de_trabajo": "Orden_de_Trabajo",
+    "tecnico": "Técnico",
+    "coord_x": "Coord_X",
+    "coord_y": "Coord_Y",
+    "duracion": "Duración",
+    "estado": "Estado",
+    "fecha": "Fecha",
+    "flag_consulta_vecino": "Flag Consulta Vecino",
+    "flag_estado_aprovision": "Flag Estado Aprovisión",
+    "flag_fallas_masivas": "Flag Fallas Masivas",
+    "flag_materiales": "Flag Materiales",
+    "flag_niveles": "Flag Niveles",
+    "hora_flag_estado_aprovision": "Hora Flag Estado Aprovisión",
+    "hora_flag_fallas_masivas": "Hora Flag Fallas Masivas",
+    "hora_flag_materiales": "Hora Flag Materiales",
+    "hora_flag_niveles": "Hora Flag Niveles",
+    "inicio": "Inicio",
+    "intervencion_neutra": "Intervención neutra",
+    "notas_consulta_vecino": "Notas Consulta Vecino",
+    "notas_consulta_vecino_ultimo": "Notas Consulta Vecino ultimo",
+    "qr_drop": "QR DROP",
+    "rut_tecnico": "Rut_tecnico",
+    "tipo_red_producto": "Tipo red producto",
+    "hora_ultima_vecino": "hora ultima vecino",
+    "hora_qr": "hora_QR",
+    "tipo_actividad": "tipo_actividad",
+    "zona_de_trabajo": "Zona de trabajo",
+    "pasos": "Pasos",
+    "pelo": "Pelo",
+}
+
+# Rows sent per executemany in set_historia_iniciados_bulk
+INSERT_CHUNK_SIZE = 1000
 
 
 class HistoriaOtEmpresas(BaseModel):
     __tablename__ = "historia_ot_empresas"
+    __table_args__ = (
+        db.Index("ix_hist_zona_fecha", "zona", "fecha"),
+        db.Index("ix_hist_empresa_fecha", "empresa", "fecha"),
+        db.Index("ix_hist_ot_fecha", "orden_de_trabajo", "fecha"),
+        db.Index("ix_hist_fecha", "fecha"),
+    )
+
     zona = db.Column(String(64), nullable=False)
     orden_de_trabajo = db.Column(String(64), nullable=False)
     empresa = db.Column(String(128), nullable=False)
@@ -16,7 +63,7 @@ class HistoriaOtEmpresas(BaseModel):
     coord_y = db.Column(String(32), nullable=False)
     duracion = db.Column(String(128), nullable=False)
     estado = db.Column(String(128), nullable=False)
-    fecha = db.Column(String(128), nullable=False)
+    fecha = db.Column(db.Date, nullable=False)
     flag_consulta_vecino = db.Column(String(128), nullable=False)
     flag_estado_aprovision = db.Column(String(128), nullable=False)
     flag_fallas_masivas = db.Column(String(128), nullable=False)
@@ -40,17 +87,37 @@ class HistoriaOtEmpresas(BaseModel):
     pasos = db.Column(String(8000), nullable=True)
     pelo = db.Column(String(128), nullable=True)
 
+    @classmethod
+    def _rango_fecha(cls, fecha_inicio: date, fecha_fin: date) -> tuple:
+        """Index-friendly bounds on fecha: inclusive start, exclusive next day."""
+        return cls.fecha >= fecha_inicio, cls.fecha < fecha_fin + timedelta(days=1)
+
     @classmethod
     def get_historia_iniciados_all(cls) -> list[dict[str, Any]]:
         return cls.query.all()
 
+    @classmethod
+    def iter_historia_iniciados_all(
+        cls, chunk_size: int = 1000
+    ) -> Iterator["HistoriaOtEmpresas"]:
+        """Stream every record, fetching chunk_size rows at a time."""
+        yield from cls.query.order_by(cls.id).enable_eagerloads(False).yield_per(
+            chunk_size
+        )
+
+    @classmethod
+    def get_historia_iniciados_paginated(cls, page: int, per_page: int):
+        return cls.query.order_by(cls.id).paginate(
+            page=page, per_page=per_page, error_out=False
+        )
+
     @classmethod
     def get_historia_iniciados_by_zona(cls, zona: str) -> list[dict[str, Any]]:
         return cls.query.filter_by(zona=zona).all()
 
     @classmethod
     def get_historia_iniciados_by_zona_and_fecha(
-        cls, zona: str, fecha: str
+        cls, zona: str, fecha: date
     ) -> list[dict[str, Any]]:
         return cls.query.filter_by(zona=zona, fecha=fecha).all()
 
@@ -60,7 +127,7 @@ class HistoriaOtEmpresas(BaseModel):
 
     @classmethod
     def get_historia_iniciados_by_ot_and_fecha(
-        cls, ot: str, fecha: str
+        cls, ot: str, fecha: date
     ) -> list[dict[str, Any]]:
         return cls.query.filter_by(orden_de_trabajo=ot, fecha=fecha).all()
 
@@ -70,68 +137,66 @@ class HistoriaOtEmpresas(BaseModel):
 
     @classmethod
     def get_historia_iniciados_by_rango_fecha(
-        cls, fecha_inicio: str, fecha_fin: str
+        cls, fecha_inicio: date, fecha_fin: date
     ) -> list[dict[str, Any]]:
-        return cls.query.filter(cls.fecha >= fecha_inicio, cls.fecha <= fecha_fin).all()
+        return cls.query.filter(*cls._rango_fecha(fecha_inicio, fecha_fin)).all()
 
     @classmethod
     def get_historia_iniciados_by_rango_fecha_and_zona(
-        cls, fecha_inicio: str, fecha_fin: str, zona: str
+        cls, fecha_inicio: date, fecha_fin: date, zona: str
     ) -> list[dict[str, Any]]:
         return cls.query.filter(
-            cls.fecha >= fecha_inicio, cls.fecha <= fecha_fin, cls.zona == zona
+            *cls._rango_fecha(fecha_inicio, fecha_fin), cls.zona == zona
         ).all()
 
     @classmethod
     def get_historia_iniciados_by_rango_fecha_and_empresa(
-        cls, fecha_inicio: str, fecha_fin: str, empresa: str
+        cls, fecha_inicio: date, fecha_fin: date, empresa: str
     ) -> list[dict[str, Any]]:
         return cls.query.filter(
-            cls.fecha >= fecha_inicio, cls.fecha <= fecha_fin, cls.empresa == empresa
+            *cls._rango_fecha(fecha_inicio, fecha_fin), cls.empresa == empresa
         ).all()
 
+    @staticmethod
+    def _build_row(data: dict[str, Any], zona: str, empresa: str) -> dict[str, Any]:
+        """Map a TOA item (Spanish JSON keys) to column values."""
+        row = {column: data[key] for column, key in KEY_MAP.items()}
+        row["fecha"] = datetime.strptime(row["fecha"], TOA_DATE_FORMAT).date()
+        row["zona"] = zona
+        row["empresa"] = empresa
+        return row
+
     @classmethod
     def set_historia_iniciados(
         cls, data: dict[str, Any], zona: str, empresa: str
     ) -> (
         None
     ):  # la zona puede sur norte, centro o metropolitana, las empresas son las que aparecen en el toa
+        cls.set_historia_iniciados_bulk([(data, empresa)], zona)
+
+    @classmethod
+    def set_historia_iniciados_bulk(
+        cls, items: Iterable[tuple[dict[str, Any], str]], zona: str
+    ) -> None:
+        """
+        Insert TOA items with executemany batches of INSERT_CHUNK_SIZE rows
+        and a single commit.
+
+        Each chunk is one Core INSERT, which the engine sends as multi-row
+        VALUES pages (insertmanyvalues) without building ORM state per row.
+        items is consumed chunk by chunk; if it raises, everything inserted
+        so far is rolled back.
+
+        Args:
+            items: Pairs of (TOA item, empresa) to insert
+            zona: Zone the items belong to (sur, norte, centro, metropolitana)
+        """
+        rows = (cls._build_row(data, zona, empresa) for data, empresa in items)
         try:
-            print(f"pasos: {data['Pasos']}")
-            nuevo_usuario = cls(
-                zona=zona,
-                empresa=empresa,
-                orden_de_trabajo=data["Orden_de_Trabajo"],
-                tecnico=data["Técnico"],
-                coord_x=data["Coord_X"],
-                coord_y=data["Coord_Y"],
-                duracion=data["Duración"],
-                estado=data["Estado"],
-                fecha=data["Fecha"],
-                flag_consulta_vecino=data["Flag Consulta Vecino"],
-                flag_estado_aprovision=data["Flag Estado Aprovisión"],
-                flag_fallas_masivas=data["Flag Fallas Masivas"],
-                flag_materiales=data["Flag Materiales"],
-                flag_niveles=data["Flag Niveles"],
-                hora_flag_estado_aprovision=data["Hora Flag Estado Aprovisión"],
-                hora_flag_fallas_masivas=data["Hora Flag Fallas Masivas"],
-                hora_flag_materiales=data["Hora Flag Materiales"],
-                hora_flag_niveles=data["Hora Flag Niveles"],
-                inicio=data["Inicio"],
-                intervencion_neutra=data["Intervención neutra"],
-                notas_consulta_vecino=data["Notas Consulta Vecino"],
-                notas_consulta_vecino_ultimo=data["Notas Consulta Vecino ultimo"],
-                qr_drop=data["QR DROP"],
-                rut_tecnico=data["Rut_tecnico"],
-                tipo_red_producto=data["Tipo red producto"],
-                hora_ultima_vecino=data["hora ultima vecino"],
-                hora_qr=data["hora_QR"],
-                tipo_actividad=data["tipo_actividad"],
-                zona_de_trabajo=data["Zona de trabajo"],
-                pasos=data["Pasos"],
-                pelo=data["Pelo"],
-            )
-            db.session.add(nuevo_usuario)
+            while chunk := list(islice(rows, INSERT_CHUNK_SIZE)):
+                for row, row_uuid in zip(chunk, uuid7_batch(len(chunk)), strict=True):
+                    row["uuid"] = row_uuid
+                db.session.execute(insert(cls), chunk)
             db.session.commit()
         except Exception as e:
             db.session.rollback()
@@ -1,16 +1,37 @@
 from sqlalchemy import String
 
-from src.models import db
-from src.models._base import BaseModel
+from src.models._db import db
+from src.models.base import BaseModel
 
 
 class OrdenTrabajo(BaseModel):
     __tablename__ = "ordenes_trabajo"
     codigo = db.Column(String(32), nullable=False, unique=True)
     id_empresa = db.Column(
-        db.Integer, db.ForeignKey("empresas_externas_toa.id"), nullable=False
+        db.Integer,
+        db.ForeignKey("empresas_externas_toa.id"),
+        nullable=False,
+        index=True,
     )
 
     empresas_externas_toa = db.relationship(
         "EmpresasExternasToa", backref="ordenes_trabajo"
     )
+
+
+# Paginated listing per empresa: WHERE id_empresa IN (...) AND active ORDER BY
+# created_at DESC, read in index order without a sort
+db.Index(
+    "ix_ordenes_trabajo_empresa_created",
+    OrdenTrabajo.id_empresa,
+    OrdenTrabajo.created_at.desc(),
+    postgresql_where=db.text("active = true"),
+)
+
+# Trigram index so the codigo ILIKE '%...%' search can use an index (pg_trgm)
+db.Index(
+    "ix_ordenes_trabajo_codigo_trgm",
+    OrdenTrabajo.codigo,
+    postgresql_using="gin",
+    postgresql_ops={"codigo": "gin_trgm_ops"},
+)
@@ -0,0 +1,25 @@
+from sqlalchemy import BigInteger, SmallInteger, String
+
+from src.models._db import db
+
+
+class TableVersion(db.Model):
+    """
+    One slot of the change counter of a table, used to build the ETags of the
+    API listings.
+
+    On PostgreSQL a statement-level trigger (see the table_versions migration)
+    increments a slot of the table on every INSERT, UPDATE, DELETE or
+    TRUNCATE, in the same transaction as the change. Concurrent transactions
+    take different slots so they do not serialize on one row; the version of
+    the table is the sum of its slots.
+    """
+
+    __tablename__ = "table_versions"
+
+    table_name = db.Column(String(64), primary_key=True)
+    slot = db.Column(SmallInteger, primary_key=True)
+    version = db.Column(BigInteger, nullable=False, server_default="0")
+
+    def __repr__(self):
+        return f"<TableVersion {self.table_name}[{self.slot}] - {self.version}>"
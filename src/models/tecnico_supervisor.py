@@ -1,17 +1,20 @@
 from sqlalchemy import String
 
-from src.models import db
-from src.models._base import BaseModel
+from src.models._db import db
+from src.models.base import BaseModel
 
 
 class TecnicoSupervisor(BaseModel):
     __tablename__ = "tecnicos_supervisores"
 
     nombre_tecnico = db.Column(String(128), nullable=False)
-    rut_tecnico = db.Column(String(16), nullable=False)
+    rut_tecnico = db.Column(String(16), nullable=False, index=True)
     nombre_supervisor = db.Column(String(128), nullable=False)
     id_empresa = db.Column(
-        db.Integer, db.ForeignKey("empresas_externas_toa.id"), nullable=False
+        db.Integer,
+        db.ForeignKey("empresas_externas_toa.id"),
+        nullable=False,
+        index=True,
     )
 
     # Relationship to empresa
@@ -19,3 +22,13 @@ class TecnicoSupervisor(BaseModel):
 
     def __repr__(self):
         return f"<TecnicoSupervisor {self.nombre_tecnico} - {self.nombre_supervisor}>"
+
+
+# One active tecnico per RUT; bulk loads insert with ON CONFLICT DO NOTHING
+# against this index so re-importing the same file is idempotent
+db.Index(
+    "uq_tecnicos_supervisores_rut_active",
+    TecnicoSupervisor.rut_tecnico,
+    unique=True,
+    postgresql_where=db.text("active = true"),
+)
@@ -0,0 +1,23 @@
+from sqlalchemy import String
+
+from src.models._db import db
+from src.models.base import BaseModel
+
+
+class UploadJob(BaseModel):
+    """File upload processed in the background; polled through its uuid."""
+
+    __tablename__ = "upload_jobs"
+
+    STATUS_PENDING = "pending"
+    STATUS_RUNNING = "running"
+    STATUS_DONE = "done"
+    STATUS_ERROR = "error"
+
+    kind = db.Column(String(64), nullable=False)
+    status = db.Column(String(16), nullable=False, default=STATUS_PENDING)
+    result = db.Column(db.JSON, nullable=True)
+    error = db.Column(String(512), nullable=True)
+
+    def __repr__(self):
+        return f"<UploadJob {self.kind} - {self.status}>"
@@ -1,11 +1,38 @@
 from typing import Optional
 
+from sqlalchemy import Row, bindparam, delete, func, select, update
+from sqlalchemy.orm import joinedload, load_only
 from werkzeug.datastructures import FileStorage
 
 from src.models import db
+from src.models.auth.user import UserEmpresa
 from src.models.comentarios import Comentario
+from src.models.orden_trabajo import OrdenTrabajo
 from src.utils.image_processor import ImageProcessor
 
+# Built once and reused so the hot listing skips Query construction and its
+# cache key is the same object on every call
+_COMENTARIOS_BY_ORDEN = (
+    select(Comentario)
+    .options(
+        # Columns shown in the comentarios list; the rest stays unloaded
+        load_only(
+            Comentario.id,
+            Comentario.comentario,
+            Comentario.num_ticket,
+            Comentario.created_at,
+            Comentario.id_usuario,
+            Comentario.imagen_path,
+            Comentario.imagen_original_name,
+        )
+    )
+    .where(
+        Comentario.id_orden_trabajo == bindparam("id_orden_trabajo"),
+        Comentario.active.is_(True),
+    )
+    .order_by(Comentario.created_at.desc())
+)
+
 
 class ComentariosService:
     """Service for managing comentarios operations."""
@@ -74,7 +101,7 @@ class ComentariosService:
             db.session.rollback()
             # Clean up uploaded image if database operation fails
             if imagen_path:
-                self.image_processor.delete_image(imagen_path)
+                self.image_processor.delete_image_after_response(imagen_path)
             raise RuntimeError(f"Error al crear el comentario: {str(e)}") from e
 
     def get_comentarios_by_orden_trabajo(
@@ -90,9 +117,10 @@ class ComentariosService:
             List of active Comentario instances ordered by creation date (newest first)
         """
         return (
-            Comentario.active_records()
-            .filter_by(id_orden_trabajo=id_orden_trabajo)
-            .order_by(Comentario.created_at.desc())
+            db.session.execute(
+                _COMENTARIOS_BY_ORDEN, {"id_orden_trabajo": id_orden_trabajo}
+            )
+            .scalars()
             .all()
         )
 
@@ -106,7 +134,21 @@ class ComentariosService:
         Returns:
             Comentario instance or None if not found
         """
-        return Comentario.query.get(comentario_id)
+        return db.session.get(Comentario, comentario_id)
+
+    def get_comentario_with_orden_by_id(self, comentario_id: int) -> Comentario | None:
+        """
+        Get a comentario by its ID with its orden de trabajo loaded in the same query.
+
+        Args:
+            comentario_id: Comentario ID
+
+        Returns:
+            Comentario instance or None if not found
+        """
+        return db.session.get(
+            Comentario, comentario_id, options=[joinedload(Comentario.orden_trabajo)]
+        )
 
     def get_comentarios_count_by_orden_trabajo(self, id_orden_trabajo: int) -> int:
         """
@@ -118,11 +160,48 @@ class ComentariosService:
         Returns:
             Number of active comentarios for the orden de trabajo
         """
-        return (
-            Comentario.active_records()
-            .filter_by(id_orden_trabajo=id_orden_trabajo)
-            .count()
+        return db.session.execute(
+            select(func.count())
+            .select_from(Comentario)
+            .where(
+                Comentario.id_orden_trabajo == id_orden_trabajo,
+                Comentario.active.is_(True),
+            )
+        ).scalar_one()
+
+    def get_orden_trabajo_with_comentarios_count(
+        self, codigo: str, user_id: int | None = None
+    ) -> Row | None:
+        """
+        Get an orden de trabajo and its count of ACTIVE comentarios in one query.
+
+        Args:
+            codigo: Orden de trabajo codigo
+            user_id: When given, only match if the orden's empresa is assigned
+                to this user
+
+        Returns:
+            Row with id, codigo, id_empresa and comentarios_count, or None if not found
+        """
+        comentarios_count = (
+            select(func.count(Comentario.id))
+            .where(
+                Comentario.id_orden_trabajo == OrdenTrabajo.id,
+                Comentario.active.is_(True),
+            )
+            .scalar_subquery()
         )
+        stmt = select(
+            OrdenTrabajo.id,
+            OrdenTrabajo.codigo,
+            OrdenTrabajo.id_empresa,
+            comentarios_count.label("comentarios_count"),
+        ).where(OrdenTrabajo.codigo == codigo)
+        if user_id is not None:
+            stmt = stmt.join(
+                UserEmpresa, UserEmpresa.empresa_id == OrdenTrabajo.id_empresa
+            ).where(UserEmpresa.user_id == user_id)
+        return db.session.execute(stmt).first()
 
     def get_all_comentarios(self) -> list[Comentario]:
         """
@@ -144,17 +223,41 @@ class ComentariosService:
             True if deleted successfully, False otherwise
         """
         try:
-            comentario = Comentario.query.get(comentario_id)
-            if not comentario:
-                return False
+            # One DELETE ... RETURNING instead of a SELECT for the image path
+            deleted = db.session.execute(
+                delete(Comentario)
+                .where(Comentario.id == comentario_id)
+                .returning(Comentario.imagen_path)
+            ).one_or_none()
+            db.session.commit()
 
-            # Delete associated image if exists
-            if comentario.imagen_path:
-                self.image_processor.delete_image(comentario.imagen_path)
+        except Exception:
+            db.session.rollback()
+            return False
+
+        if deleted is None:
+            return False
+
+        # The image goes only once the row is gone, so a failed delete keeps it
+        if deleted.imagen_path:
+            self.image_processor.delete_image_after_response(deleted.imagen_path)
+        return True
+
+    def _set_comentario_active(self, comentario_id: int, active: bool) -> bool:
+        """
+        Flip the active flag with a single UPDATE.
 
-            db.session.delete(comentario)
+        Only rows in the opposite state are touched, so False means the
+        comentario does not exist or already had that state.
+        """
+        try:
+            result = db.session.execute(
+                update(Comentario)
+                .where(Comentario.id == comentario_id, Comentario.active.is_(not active))
+                .values(active=active)
+            )
             db.session.commit()
-            return True
+            return result.rowcount > 0
 
         except Exception:
             db.session.rollback()
@@ -168,20 +271,9 @@ class ComentariosService:
             comentario_id: Comentario ID
 
         Returns:
-            True if soft deleted successfully, False otherwise
+            True if soft deleted, False if not found, already inactive or on error
         """
-        try:
-            comentario = Comentario.query.get(comentario_id)
-            if not comentario:
-                return False
-
-            comentario.soft_delete()
-            db.session.commit()
-            return True
-
-        except Exception:
-            db.session.rollback()
-            return False
+        return self._set_comentario_active(comentario_id, False)
 
     def get_all_comentarios_including_inactive(self) -> list[Comentario]:
         """
@@ -227,17 +319,6 @@ class ComentariosService:
             comentario_id: Comentario ID
 
         Returns:
-            True if restored successfully, False otherwise
+            True if restored, False if not found, already active or on error
         """
-        try:
-            comentario = Comentario.query.get(comentario_id)
-            if not comentario:
-                return False
-
-            comentario.restore()
-            db.session.commit()
-            return True
-
-        except Exception:
-            db.session.rollback()
-            return False
+        return self._set_comentario_active(comentario_id, True)
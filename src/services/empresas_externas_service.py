@@ -1,11 +1,83 @@
-from typing import Any
+from typing import Any, NamedTuple
 
+from sqlalchemy import select
+
+from src.cache import cache
+from src.models import db
 from src.models.empresas_externas_toa import EmpresasExternasToa
 
+# Seconds an empresas snapshot is served before it is reloaded
+EMPRESAS_CACHE_TTL = 300
+
+
+class EmpresaSnapshot(NamedTuple):
+    """Immutable copy of an empresa, safe to share across requests."""
+
+    id: int
+    nombre: str
+    nombre_toa: str
+    rut: str
+
+
+def _load_empresas() -> tuple[EmpresaSnapshot, ...]:
+    rows = db.session.execute(
+        select(
+            EmpresasExternasToa.id,
+            EmpresasExternasToa.nombre,
+            EmpresasExternasToa.nombre_toa,
+            EmpresasExternasToa.rut,
+        ).order_by(EmpresasExternasToa.id)
+    ).all()
+    return tuple(EmpresaSnapshot(*row) for row in rows)
+
+
+@cache.memoize(timeout=EMPRESAS_CACHE_TTL)
+def get_empresas_snapshot() -> tuple[EmpresaSnapshot, ...]:
+    """
+    Get every empresa as a cached, session-independent snapshot.
+
+    Empresas change rarely, so the table is read at most once per TTL (per
+    cache) instead of on every render that needs the dropdown. The cache is
+    only cleared in the process that writes, so the snapshot is for display
+    (dropdowns) only; validations and uploads read the table itself.
+
+    Returns:
+        Tuple of EmpresaSnapshot
+    """
+    return _load_empresas()
+
+
+def invalidate_empresas_cache() -> None:
+    """Drop the cached empresas snapshot so the next read hits the database."""
+    cache.delete_memoized(get_empresas_snapshot)
+
 
 class EmpresasExternasService:
-    def get_empresas_externas_toa_all(self) -> list[dict[str, Any]]:
-        return EmpresasExternasToa.get_empresas_externas_toa_all()
+    def get_empresas_externas_toa_all(self) -> list[EmpresaSnapshot]:
+        return list(_load_empresas())
+
+    def get_empresa_ids(self) -> set[int]:
+        return set(db.session.execute(select(EmpresasExternasToa.id)).scalars())
 
     def set_empresas_externas_toa(self, nombre: str, nombre_toa: str, rut: str) -> bool:
-        return EmpresasExternasToa.set_empresas_externas_toa(nombre, nombre_toa, rut)
+        try:
+            return EmpresasExternasToa.set_empresas_externas_toa(nombre, nombre_toa, rut)
+        finally:
+            invalidate_empresas_cache()
+
+    def set_empresas_externas_toa_bulk(self, rows: list[dict[str, Any]]) -> bool:
+        """
+        Insert several empresas in one transaction.
+
+        Args:
+            rows: Dicts with nombre, nombre_toa and rut
+
+        Returns:
+            True when the rows were committed
+        """
+        if not rows:
+            return True
+        try:
+            return EmpresasExternasToa.set_many(rows)
+        finally:
+            invalidate_empresas_cache()
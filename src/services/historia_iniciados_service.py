@@ -1,22 +1,45 @@
+from collections.abc import Iterable, Iterator
+from datetime import date
 from typing import Any
 
+from src.cache import invalidate_namespace
 from src.models.historia_ot_empresas import HistoriaOtEmpresas
 
+# Cache namespace of every historia read; cleared whenever rows are loaded
+HISTORIA_CACHE_NAMESPACE = "historia"
+
 
 class HistoriaIniciadosService:
     def set_data_to_database(
         self, data: dict[str, Any], zona: str, empresa: str
     ) -> None:
-        HistoriaOtEmpresas.set_historia_iniciados(data, zona, empresa)
+        try:
+            HistoriaOtEmpresas.set_historia_iniciados(data, zona, empresa)
+        finally:
+            invalidate_namespace(HISTORIA_CACHE_NAMESPACE)
+
+    def set_data_to_database_bulk(
+        self, items: Iterable[tuple[dict[str, Any], str]], zona: str
+    ) -> None:
+        try:
+            HistoriaOtEmpresas.set_historia_iniciados_bulk(items, zona)
+        finally:
+            invalidate_namespace(HISTORIA_CACHE_NAMESPACE)
 
     def get_historia_iniciados(self) -> list[dict[str, Any]]:
         return HistoriaOtEmpresas.get_historia_iniciados_all()
 
+    def iter_historia_iniciados(self) -> Iterator[HistoriaOtEmpresas]:
+        return HistoriaOtEmpresas.iter_historia_iniciados_all()
+
+    def get_historia_iniciados_paginated(self, page: int, per_page: int):
+        return HistoriaOtEmpresas.get_historia_iniciados_paginated(page, per_page)
+
     def get_historia_iniciados_by_zona(self, zona: str) -> list[dict[str, Any]]:
         return HistoriaOtEmpresas.get_historia_iniciados_by_zona(zona)
 
     def get_historia_iniciados_by_zona_and_fecha(
-        self, zona: str, fecha: str
+        self, zona: str, fecha: date
     ) -> list[dict[str, Any]]:
         return HistoriaOtEmpresas.get_historia_iniciados_by_zona_and_fecha(zona, fecha)
 
@@ -24,7 +47,7 @@ class HistoriaIniciadosService:
         return HistoriaOtEmpresas.get_historia_iniciados_by_ot(ot)
 
     def get_historia_iniciados_by_ot_and_fecha(
-        self, ot: str, fecha: str
+        self, ot: str, fecha: date
     ) -> list[dict[str, Any]]:
         return HistoriaOtEmpresas.get_historia_iniciados_by_ot_and_fecha(ot, fecha)
 
@@ -32,7 +55,7 @@ class HistoriaIniciadosService:
         return HistoriaOtEmpresas.get_historia_iniciados_by_empresa(empresa)
 
     def get_historia_iniciados_by_rango_fecha(
-        self, fecha_inicio: str, fecha_fin: str
+        self, fecha_inicio: date, fecha_fin: date
     ) -> list[dict[str, Any]]:
         return HistoriaOtEmpresas.get_historia_iniciados_by_rango_fecha(
             fecha_inicio, fecha_fin
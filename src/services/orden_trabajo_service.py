@@ -1,10 +1,143 @@
+from collections.abc import Iterator
+from datetime import datetime, timedelta
 from typing import Any
 
+from sqlalchemy import bindparam, select, tuple_
 from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import joinedload, selectinload
 
 from src.models import db
+from src.models.auth.user import UserEmpresa
+from src.models.base import uuid7_batch
+from src.models.comentarios import Comentario
 from src.models.orden_trabajo import OrdenTrabajo
 
+# Built once so the by-codigo lookup reuses the same cached compiled SELECT
+_ORDEN_BY_CODIGO = select(OrdenTrabajo).where(
+    OrdenTrabajo.codigo == bindparam("codigo")
+)
+
+# Same lookup, restricted to the empresas assigned to a user (access check in SQL)
+_ORDEN_BY_CODIGO_FOR_USER = _ORDEN_BY_CODIGO.join(
+    UserEmpresa, UserEmpresa.empresa_id == OrdenTrabajo.id_empresa
+).where(UserEmpresa.user_id == bindparam("user_id"))
+
+# Keyset pagination cursor: "<created_at ISO>_<id>" of the boundary orden
+_CURSOR_SEPARATOR = "_"
+
+
+def _encode_cursor(orden: OrdenTrabajo) -> str:
+    return f"{orden.created_at.isoformat()}{_CURSOR_SEPARATOR}{orden.id}"
+
+
+def _decode_cursor(cursor: str | None) -> tuple[datetime, int] | None:
+    """Parse a cursor; malformed values are ignored like bad date filters."""
+    if not cursor:
+        return None
+    try:
+        created_at, orden_id = cursor.rsplit(_CURSOR_SEPARATOR, 1)
+        return datetime.fromisoformat(created_at), int(orden_id)
+    except ValueError:
+        return None
+
+
+def _seek_page(
+    query, per_page: int, after: str | None, before: str | None
+) -> tuple[list[OrdenTrabajo], dict[str, Any]]:
+    """
+    Keyset (seek) pagination over ordenes, newest first.
+
+    Pages are delimited by the (created_at, id) of their boundary ordenes
+    instead of an OFFSET, so every page costs the same index range scan and
+    no COUNT(*) is needed.
+
+    Args:
+        query: Filtered OrdenTrabajo query, without ordering
+        per_page: Number of ordenes per page
+        after: Cursor to continue after (older ordenes)
+        before: Cursor to go back from (newer ordenes); takes precedence
+
+    Returns:
+        Tuple of (ordenes of the page, pagination metadata)
+    """
+    key = tuple_(OrdenTrabajo.created_at, OrdenTrabajo.id)
+    # The listing shows each orden's empresa and comentarios count; load them
+    # with the page instead of two lazy loads per orden
+    query = query.options(
+        joinedload(OrdenTrabajo.empresas_externas_toa),
+        selectinload(OrdenTrabajo.comentarios).load_only(
+            Comentario.id, Comentario.id_orden_trabajo
+        ),
+    )
+    before_key = _decode_cursor(before)
+    after_key = None if before_key else _decode_cursor(after)
+
+    if before_key:
+        rows = (
+            query.filter(key > before_key)
+            .order_by(OrdenTrabajo.created_at.asc(), OrdenTrabajo.id.asc())
+            .limit(per_page + 1)
+            .all()
+        )
+        has_prev = len(rows) > per_page
+        has_next = True
+        ordenes = rows[:per_page][::-1]
+    else:
+        if after_key:
+            query = query.filter(key < after_key)
+        rows = (
+            query.order_by(OrdenTrabajo.created_at.desc(), OrdenTrabajo.id.desc())
+            .limit(per_page + 1)
+            .all()
+        )
+        has_prev = after_key is not None
+        has_next = len(rows) > per_page
+        ordenes = rows[:per_page]
+
+    return ordenes, {
+        "per_page": per_page,
+        "has_prev": has_prev and bool(ordenes),
+        "has_next": has_next and bool(ordenes),
+        "prev_cursor": _encode_cursor(ordenes[0]) if ordenes else None,
+        "next_cursor": _encode_cursor(ordenes[-1]) if ordenes else None,
+    }
+
+
+def _parse_search_date(value: str | None) -> datetime | None:
+    """Parse a YYYY-MM-DD search date; invalid dates disable their filter."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        return None
+
+
+def _apply_search_filters(
+    query,
+    search_codigo: str | None,
+    search_fecha_inicio: str | None,
+    search_fecha_fin: str | None,
+):
+    """Apply the codigo and created_at range filters of the ordenes listings."""
+    if search_codigo:
+        # Escape % and _ so user input matches literally
+        query = query.filter(
+            OrdenTrabajo.codigo.icontains(search_codigo, autoescape=True)
+        )
+
+    fecha_inicio = _parse_search_date(search_fecha_inicio)
+    if fecha_inicio:
+        query = query.filter(OrdenTrabajo.created_at >= fecha_inicio)
+
+    fecha_fin = _parse_search_date(search_fecha_fin)
+    if fecha_fin:
+        # Add one day to include the entire end date
+        fecha_fin = fecha_fin + timedelta(days=1)
+        query = query.filter(OrdenTrabajo.created_at < fecha_fin)
+
+    return query
+
 
 class OrdenTrabajoService:
     def create_orden_trabajo(self, codigo: str, id_empresa: int) -> OrdenTrabajo:
@@ -20,6 +153,13 @@ class OrdenTrabajoService:
         """
         Create multiple ordenes de trabajo using efficient ON CONFLICT DO NOTHING.
 
+        Rows go through a single Core executemany (no ORM instances), which
+        the engine sends in multi-row VALUES pages of insertmanyvalues_page_size
+        rows (see Config.SQLALCHEMY_ENGINE_OPTIONS).
+
+        Args:
+            ordenes_data: Dicts with codigo and id_empresa
+
         Returns:
             Dictionary with detailed results including which codes were inserted, not_inserted, and had errors
         """
@@ -27,59 +167,70 @@ class OrdenTrabajoService:
             return {
                 "inserted": [],
                 "not_inserted": [],
+                "duplicated": [],
                 "errors": [],
                 "inserted_count": 0,
                 "total_count": 0,
                 "skipped_count": 0,
+                "duplicated_count": 0,
             }
 
-        # Prepare data for bulk insert with conflict handling
-        import uuid
-        from datetime import datetime
-
-        insert_data = []
-        all_codigos = []
-
+        # Repeated codigos within the batch would only be dropped by ON CONFLICT;
+        # keep the first occurrence and report the rest without sending them
+        unique_ordenes: dict[str, dict[str, Any]] = {}
+        duplicated_codigos = []
         for orden_data in ordenes_data:
             codigo = orden_data["codigo"]
-            all_codigos.append(codigo)
-
-            # Add BaseModel fields with defaults
-            insert_data.append(
-                {
-                    "codigo": codigo,
-                    "id_empresa": orden_data["id_empresa"],
-                    "uuid": str(uuid.uuid4()),
-                    "created_at": datetime.now(),
-                    "updated_at": datetime.now(),
-                    "active": True,
-                }
+            if codigo in unique_ordenes:
+                duplicated_codigos.append(codigo)
+            else:
+                unique_ordenes[codigo] = orden_data
+
+        # Prepare data for bulk insert with conflict handling. The uuids are
+        # generated in one batch; active and the timestamps come from the
+        # column defaults.
+        insert_data = [
+            {
+                "codigo": orden_data["codigo"],
+                "id_empresa": orden_data["id_empresa"],
+                "uuid": row_uuid,
+            }
+            for orden_data, row_uuid in zip(
+                unique_ordenes.values(), uuid7_batch(len(unique_ordenes)), strict=True
             )
+        ]
+        all_codigos = list(unique_ordenes)
 
         try:
-            # Use PostgreSQL's INSERT ... ON CONFLICT DO NOTHING with RETURNING
-            stmt = insert(OrdenTrabajo).values(insert_data)
+            # Use PostgreSQL's INSERT ... ON CONFLICT DO NOTHING with RETURNING.
+            # The rows are passed as executemany parameters so the statement is
+            # compiled once (and cached) and SQLAlchemy batches it into
+            # multi-row VALUES pages, instead of rendering one giant statement.
+            stmt = insert(OrdenTrabajo)
             stmt = stmt.on_conflict_do_nothing(index_elements=["codigo"])
             stmt = stmt.returning(OrdenTrabajo.codigo)
 
-            result = db.session.execute(stmt)
+            result = db.session.execute(stmt, insert_data)
             db.session.commit()
 
             # Get the codes that were actually inserted
-            inserted_codes = [row[0] for row in result.fetchall()]
+            inserted_codes = list(result.scalars())
+            inserted_set = set(inserted_codes)
 
             # Calculate not_inserted (codes that existed and were skipped)
-            not_inserted_codes = [
-                codigo for codigo in all_codigos if codigo not in inserted_codes
+            existing_codes = [
+                codigo for codigo in all_codigos if codigo not in inserted_set
             ]
 
             return {
                 "inserted": inserted_codes,
-                "not_inserted": not_inserted_codes,
+                "not_inserted": existing_codes + duplicated_codigos,
+                "duplicated": duplicated_codigos,
                 "errors": [],  # No errors if we reach here
                 "inserted_count": len(inserted_codes),
                 "total_count": len(ordenes_data),
-                "skipped_count": len(not_inserted_codes),
+                "skipped_count": len(existing_codes),
+                "duplicated_count": len(duplicated_codigos),
                 "error_count": 0,
             }
 
@@ -88,27 +239,55 @@ class OrdenTrabajoService:
             # If there's a database error, all codes go to errors
             return {
                 "inserted": [],
-                "not_inserted": [],
+                "not_inserted": duplicated_codigos,
+                "duplicated": duplicated_codigos,
                 "errors": all_codigos,
                 "inserted_count": 0,
                 "total_count": len(ordenes_data),
                 "skipped_count": 0,
+                "duplicated_count": len(duplicated_codigos),
                 "error_count": len(all_codigos),
             }
 
     def get_orden_trabajo_by_codigo(self, codigo: str) -> OrdenTrabajo | None:
         """Get orden de trabajo by codigo"""
-        return OrdenTrabajo.query.filter_by(codigo=codigo).first()
+        return db.session.execute(
+            _ORDEN_BY_CODIGO, {"codigo": codigo}
+        ).scalar_one_or_none()
+
+    def get_orden_trabajo_for_user(
+        self, codigo: str, user_id: int
+    ) -> OrdenTrabajo | None:
+        """
+        Get an orden de trabajo by codigo only if its empresa is assigned to the user.
+
+        Args:
+            codigo: Orden de trabajo codigo
+            user_id: ID of the user whose empresas grant access
 
-    def get_ordenes_trabajo_all(self) -> list[OrdenTrabajo]:
-        """Get all ordenes de trabajo"""
-        return OrdenTrabajo.query.all()
+        Returns:
+            OrdenTrabajo instance, or None if not found or not accessible
+        """
+        return db.session.execute(
+            _ORDEN_BY_CODIGO_FOR_USER, {"codigo": codigo, "user_id": user_id}
+        ).scalar_one_or_none()
+
+    def iter_ordenes_trabajo_all(
+        self, chunk_size: int = 1000
+    ) -> Iterator[OrdenTrabajo]:
+        """Stream every orden de trabajo, fetching chunk_size rows at a time."""
+        yield from (
+            OrdenTrabajo.query.order_by(OrdenTrabajo.id)
+            .enable_eagerloads(False)
+            .yield_per(chunk_size)
+        )
 
     def get_ordenes_trabajo_by_user_empresas(
         self,
         user_empresa_ids: list[int],
-        page: int = 1,
         per_page: int = 10,
+        after: str | None = None,
+        before: str | None = None,
         search_codigo: str = None,
         search_fecha_inicio: str = None,
         search_fecha_fin: str = None,
@@ -118,8 +297,9 @@ class OrdenTrabajoService:
 
         Args:
             user_empresa_ids: List of empresa IDs the user has access to
-            page: Page number (1-indexed)
-            per_page: Number of records per page (max 20)
+            per_page: Number of records per page (max 10)
+            after: Cursor of the last orden of the previous page (next page)
+            before: Cursor of the first orden of the following page (previous page)
             search_codigo: Optional codigo filter
             search_fecha_inicio: Optional start date filter (YYYY-MM-DD)
             search_fecha_fin: Optional end date filter (YYYY-MM-DD)
@@ -127,7 +307,6 @@ class OrdenTrabajoService:
         Returns:
             Dictionary with paginated results and metadata
         """
-        from datetime import datetime
 
         # Ensure per_page doesn't exceed maximum
         per_page = min(per_page, 10)
@@ -138,45 +317,15 @@ class OrdenTrabajoService:
         )
 
         # Apply search filters
-        if search_codigo:
-            query = query.filter(OrdenTrabajo.codigo.ilike(f"%{search_codigo}%"))
-
-        if search_fecha_inicio:
-            try:
-                fecha_inicio = datetime.strptime(search_fecha_inicio, "%Y-%m-%d")
-                query = query.filter(OrdenTrabajo.created_at >= fecha_inicio)
-            except ValueError:
-                pass  # Invalid date format, ignore filter
-
-        if search_fecha_fin:
-            try:
-                fecha_fin = datetime.strptime(search_fecha_fin, "%Y-%m-%d")
-                # Add one day to include the entire end date
-                from datetime import timedelta
-
-                fecha_fin = fecha_fin + timedelta(days=1)
-                query = query.filter(OrdenTrabajo.created_at < fecha_fin)
-            except ValueError:
-                pass  # Invalid date format, ignore filter
-
-        # Order by most recent first
-        query = query.order_by(OrdenTrabajo.created_at.desc())
+        query = _apply_search_filters(
+            query, search_codigo, search_fecha_inicio, search_fecha_fin
+        )
 
-        # Apply pagination
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        ordenes, pagination = _seek_page(query, per_page, after, before)
 
         return {
-            "ordenes": pagination.items,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": pagination.total,
-                "pages": pagination.pages,
-                "has_prev": pagination.has_prev,
-                "has_next": pagination.has_next,
-                "prev_num": pagination.prev_num,
-                "next_num": pagination.next_num,
-            },
+            "ordenes": ordenes,
+            "pagination": pagination,
             "search_filters": {
                 "codigo": search_codigo,
                 "fecha_inicio": search_fecha_inicio,
@@ -186,8 +335,9 @@ class OrdenTrabajoService:
 
     def get_ordenes_trabajo_admin(
         self,
-        page: int = 1,
         per_page: int = 10,
+        after: str | None = None,
+        before: str | None = None,
         search_codigo: str = None,
         search_fecha_inicio: str = None,
         search_fecha_fin: str = None,
@@ -198,8 +348,9 @@ class OrdenTrabajoService:
         Admins can see all ordenes and filter by empresa.
 
         Args:
-            page: Page number (1-indexed)
-            per_page: Number of records per page (max 20)
+            per_page: Number of records per page (max 10)
+            after: Cursor of the last orden of the previous page (next page)
+            before: Cursor of the first orden of the following page (previous page)
             search_codigo: Optional codigo filter
             search_fecha_inicio: Optional start date filter (YYYY-MM-DD)
             search_fecha_fin: Optional end date filter (YYYY-MM-DD)
@@ -208,7 +359,6 @@ class OrdenTrabajoService:
         Returns:
             Dictionary with paginated results and metadata
         """
-        from datetime import datetime
 
         # Ensure per_page doesn't exceed maximum
         per_page = min(per_page, 10)
@@ -217,49 +367,19 @@ class OrdenTrabajoService:
         query = OrdenTrabajo.active_records()
 
         # Apply search filters
-        if search_codigo:
-            query = query.filter(OrdenTrabajo.codigo.ilike(f"%{search_codigo}%"))
-
-        if search_fecha_inicio:
-            try:
-                fecha_inicio = datetime.strptime(search_fecha_inicio, "%Y-%m-%d")
-                query = query.filter(OrdenTrabajo.created_at >= fecha_inicio)
-            except ValueError:
-                pass  # Invalid date format, ignore filter
-
-        if search_fecha_fin:
-            try:
-                fecha_fin = datetime.strptime(search_fecha_fin, "%Y-%m-%d")
-                # Add one day to include the entire end date
-                from datetime import timedelta
-
-                fecha_fin = fecha_fin + timedelta(days=1)
-                query = query.filter(OrdenTrabajo.created_at < fecha_fin)
-            except ValueError:
-                pass  # Invalid date format, ignore filter
+        query = _apply_search_filters(
+            query, search_codigo, search_fecha_inicio, search_fecha_fin
+        )
 
         # Admin-specific: filter by empresa if specified
         if search_empresa_id:
             query = query.filter(OrdenTrabajo.id_empresa == search_empresa_id)
 
-        # Order by most recent first
-        query = query.order_by(OrdenTrabajo.created_at.desc())
-
-        # Apply pagination
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        ordenes, pagination = _seek_page(query, per_page, after, before)
 
         return {
-            "ordenes": pagination.items,
-            "pagination": {
-                "page": page,
-                "per_page": per_page,
-                "total": pagination.total,
-                "pages": pagination.pages,
-                "has_prev": pagination.has_prev,
-                "has_next": pagination.has_next,
-                "prev_num": pagination.prev_num,
-                "next_num": pagination.next_num,
-            },
+            "ordenes": ordenes,
+            "pagination": pagination,
             "search_filters": {
                 "codigo": search_codigo,
                 "fecha_inicio": search_fecha_inicio,
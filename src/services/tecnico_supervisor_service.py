@@ -1,10 +1,24 @@
+from collections.abc import Iterable, Iterator
+from contextlib import closing
+from itertools import islice
+from operator import itemgetter
 from typing import Any
-import os
-import tempfile
+
+import openpyxl
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
 
 from src.models import db
+from src.models.base import uuid7_batch
 from src.models.tecnico_supervisor import TecnicoSupervisor
 
+# Rows per INSERT ... RETURNING executemany in create_tecnicos_supervisores_bulk
+INSERT_CHUNK_SIZE = 1000
+
+# Consecutive empty rows after which iter_excel_rows stops reading the sheet;
+# formatted but empty trailing rows are still yielded by openpyxl
+MAX_BLANK_EXCEL_ROWS = 1000
+
 
 class TecnicoSupervisorService:
     """Service for managing TecnicoSupervisor database operations."""
@@ -19,6 +33,8 @@ class TecnicoSupervisorService:
         """
         Create a new tecnico supervisor record.
 
+        Goes through create_tecnicos_supervisores_bulk as a bulk of one row.
+
         Args:
             nombre_tecnico: Name of the technician
             rut_tecnico: RUT of the technician
@@ -29,65 +45,113 @@ class TecnicoSupervisorService:
             Created TecnicoSupervisor instance
 
         Raises:
-            RuntimeError: If database operation fails
+            RuntimeError: If database operation fails, e.g. an active tecnico
+                with the same RUT already exists
         """
-        try:
-            tecnico_supervisor = TecnicoSupervisor(
-                nombre_tecnico=nombre_tecnico.strip(),
-                rut_tecnico=rut_tecnico.strip(),
-                nombre_supervisor=nombre_supervisor.strip(),
-                id_empresa=id_empresa,
+        result = self.create_tecnicos_supervisores_bulk(
+            [
+                {
+                    "nombre_tecnico": nombre_tecnico,
+                    "rut_tecnico": rut_tecnico,
+                    "nombre_supervisor": nombre_supervisor,
+                    "id_empresa": id_empresa,
+                }
+            ]
+        )
+        if not result["created_ids"]:
+            raise RuntimeError(
+                "Error al crear el técnico supervisor: ya existe un técnico activo "
+                f"con el RUT {rut_tecnico.strip()}"
             )
-
-            db.session.add(tecnico_supervisor)
-            db.session.commit()
-
-            return tecnico_supervisor
-
-        except Exception as e:
-            db.session.rollback()
-            raise RuntimeError(f"Error al crear el técnico supervisor: {str(e)}") from e
+        return db.session.get(TecnicoSupervisor, result["created_ids"][0])
 
     def create_tecnicos_supervisores_bulk(
-        self, tecnicos_data: list[dict[str, Any]]
+        self,
+        tecnicos_data: Iterable[dict[str, Any]],
+        chunk_size: int = INSERT_CHUNK_SIZE,
     ) -> dict[str, Any]:
         """
         Create multiple tecnico supervisor records in bulk.
 
+        Rows are consumed and sent chunk_size at a time and committed once at
+        the end, so a generator (e.g. an Excel import) is never held in memory
+        whole and each statement and its parameters stay bounded.
+
+        A RUT repeated in the input is only inserted the first time, and a RUT
+        that already has an active tecnico is skipped by the database, so
+        loading the same file twice creates nothing the second time.
+
         Args:
-            tecnicos_data: List of dictionaries with tecnico data
+            tecnicos_data: Iterable of dictionaries with tecnico data
+            chunk_size: Number of rows per INSERT statement
 
         Returns:
-            Dictionary with operation results
+            Dictionary with operation results; skipped_count are RUTs that
+            already existed and duplicated_count RUTs repeated in the input
 
         Raises:
-            RuntimeError: If database operation fails
+            ValueError: If tecnicos_data raises it; nothing is committed
+            RuntimeError: If database operation fails or tecnicos_data raises it
         """
+        rows_iter = iter(tecnicos_data)
+        created_ids = []
+        total_count = 0
+        unique_count = 0
+        seen_ruts = set()
+
         try:
-            created_count = 0
-            created_ids = []
-
-            for data in tecnicos_data:
-                tecnico_supervisor = TecnicoSupervisor(
-                    nombre_tecnico=data["nombre_tecnico"].strip(),
-                    rut_tecnico=data["rut_tecnico"].strip(),
-                    nombre_supervisor=data["nombre_supervisor"].strip(),
-                    id_empresa=data["id_empresa"],
+            # One executemany INSERT ... RETURNING per chunk (sent as multi-row
+            # VALUES pages) instead of a flush per row; the uuids are generated
+            # per chunk, timestamps and active come from the column defaults.
+            # Rows whose RUT already has an active tecnico return no id.
+            stmt = (
+                insert(TecnicoSupervisor)
+                .on_conflict_do_nothing(
+                    index_elements=["rut_tecnico"],
+                    index_where=text("active = true"),
                 )
-
-                db.session.add(tecnico_supervisor)
-                db.session.flush()  # Get the ID without committing
-                created_ids.append(tecnico_supervisor.id)
-                created_count += 1
-
+                .returning(TecnicoSupervisor.id)
+            )
+            while chunk := list(islice(rows_iter, chunk_size)):
+                total_count += len(chunk)
+                unique_rows = []
+                for data in chunk:
+                    rut_tecnico = data["rut_tecnico"].strip()
+                    if rut_tecnico in seen_ruts:
+                        continue
+                    seen_ruts.add(rut_tecnico)
+                    unique_rows.append((data, rut_tecnico))
+                if not unique_rows:
+                    continue
+
+                unique_count += len(unique_rows)
+                rows = [
+                    {
+                        "nombre_tecnico": data["nombre_tecnico"].strip(),
+                        "rut_tecnico": rut_tecnico,
+                        "nombre_supervisor": data["nombre_supervisor"].strip(),
+                        "id_empresa": data["id_empresa"],
+                        "uuid": row_uuid,
+                    }
+                    for (data, rut_tecnico), row_uuid in zip(
+                        unique_rows, uuid7_batch(len(unique_rows)), strict=True
+                    )
+                ]
+                created_ids.extend(db.session.execute(stmt, rows).scalars())
             db.session.commit()
 
             return {
-                "created_count": created_count,
+                "created_count": len(created_ids),
                 "created_ids": created_ids,
-                "total_count": len(tecnicos_data),
+                "skipped_count": unique_count - len(created_ids),
+                "duplicated_count": total_count - unique_count,
+                "total_count": total_count,
             }
 
+        except (ValueError, RuntimeError):
+            # Raised by tecnicos_data itself (validation or file errors)
+            db.session.rollback()
+            raise
         except Exception as e:
             db.session.rollback()
             raise RuntimeError(
@@ -118,24 +182,41 @@ class TecnicoSupervisorService:
         """
         return TecnicoSupervisor.active_records().filter_by(id=tecnico_id).first()
 
-    def get_all_tecnicos_supervisores(self) -> list[TecnicoSupervisor]:
+    def iter_all_tecnicos_supervisores(
+        self, chunk_size: int = 1000
+    ) -> Iterator[TecnicoSupervisor]:
         """
-        Get all tecnicos supervisores from all empresas.
+        Stream the tecnicos supervisores of all empresas.
 
-        Returns:
-            List of all TecnicoSupervisor instances
-        """
-        return TecnicoSupervisor.active_records().all()
+        Rows are fetched chunk_size at a time (server-side cursor on
+        PostgreSQL), so memory does not grow with the size of the table.
+
+        Args:
+            chunk_size: Number of rows fetched per round trip
 
-    def process_excel_file(self, file_storage) -> list[dict[str, Any]]:
+        Yields:
+            Active TecnicoSupervisor instances ordered by id
+        """
+        yield from (
+            TecnicoSupervisor.active_records()
+            .order_by(TecnicoSupervisor.id)
+            .enable_eagerloads(False)
+            .yield_per(chunk_size)
+        )
+
+    def iter_excel_rows(self, file_storage) -> Iterator[dict[str, str]]:
         """
-        Process an uploaded Excel file and extract technician data.
+        Parse an uploaded Excel file and yield its technician rows one at a time.
+
+        The sheet is read while the caller consumes the rows, so only the
+        current row is kept in memory. The checks below run on the first
+        iteration.
 
         Args:
             file_storage: FileStorage object from Flask request
 
-        Returns:
-            List of dictionaries with technician data
+        Yields:
+            Dictionaries with the required columns of each complete row
 
         Raises:
             ValueError: If file processing fails
@@ -150,32 +231,32 @@ class TecnicoSupervisorService:
             if not filename.endswith((".xlsx", ".xls")):
                 raise ValueError("El archivo debe ser un Excel (.xlsx o .xls)")
 
-            # Save file temporarily
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as temp_file:
-                temp_filepath = temp_file.name
-                file_storage.save(temp_filepath)
-
-            try:
-                # Process Excel file
-                import openpyxl
-
-                wb = openpyxl.load_workbook(temp_filepath, read_only=True)
-
-                # Use first sheet if multiple sheets exist
-                sheet_name = wb.sheetnames[0]
-                ws = wb[sheet_name]
-
-                tecnicos_data = []
-
-                # Assume first row contains headers
-                # Expected columns: nombre_tecnico, rut_tecnico, nombre_supervisor, id_empresa
-                headers = []
-                for col_num in range(1, ws.max_column + 1):
-                    cell_value = ws.cell(row=1, column=col_num).value
+            # The upload is read straight from its stream; werkzeug already
+            # spools large request files to disk, so no temporary copy is made.
+            # Formula cells yield their cached values and external links are
+            # not loaded; only the values of the first sheet are needed.
+            with closing(
+                openpyxl.load_workbook(
+                    file_storage.stream,
+                    read_only=True,
+                    data_only=True,
+                    keep_links=False,
+                )
+            ) as wb:
+                # Use first sheet if multiple sheets exist. Rows are read
+                # sequentially: in read-only mode ws.cell() and ws.max_row
+                # re-parse the sheet XML on every call.
+                ws = wb[wb.sheetnames[0]]
+
+                # Assume first row contains headers; the first column with
+                # each name wins. Expected columns: nombre_tecnico,
+                # rut_tecnico, nombre_supervisor, id_empresa
+                header_row = next(ws.iter_rows(max_row=1, values_only=True), ())
+                header_map = {}
+                for col_index, cell_value in enumerate(header_row):
                     if cell_value:
-                        headers.append(str(cell_value).strip().lower())
-                    else:
-                        headers.append(f"col_{col_num}")
+                        header = str(cell_value).strip().lower()
+                        header_map.setdefault(header, col_index)
 
                 # Validate required columns exist
                 required_columns = [
@@ -184,59 +265,49 @@ class TecnicoSupervisorService:
                     "nombre_supervisor",
                     "id_empresa",
                 ]
-                missing_columns = []
-                for req_col in required_columns:
-                    if req_col not in headers:
-                        missing_columns.append(req_col)
-
+                missing_columns = [
+                    req_col for req_col in required_columns if req_col not in header_map
+                ]
                 if missing_columns:
                     raise ValueError(
                         f"Columnas requeridas faltantes: {', '.join(missing_columns)}"
                     )
 
-                # Get column indices
-                col_indices = {col: headers.index(col) for col in required_columns}
-
-                # Process data rows (skip header)
-                for row_num in range(2, ws.max_row + 1):
-                    row_data = {}
-                    skip_row = True
-
-                    for col_name, col_idx in col_indices.items():
-                        cell_value = ws.cell(row=row_num, column=col_idx + 1).value
-                        if cell_value is not None:
-                            value = str(cell_value).strip()
-                            if value:  # Not empty
-                                row_data[col_name] = value
-                                if col_name in required_columns:
-                                    skip_row = False
-                        else:
-                            row_data[col_name] = ""
-
-                    # Only add row if it has at least one required field
-                    if not skip_row and all(
-                        row_data.get(col, "") for col in required_columns
-                    ):
-                        tecnicos_data.append(row_data)
-
-                wb.close()
-
-                if not tecnicos_data:
-                    raise ValueError(
-                        "No se encontraron datos válidos en el archivo Excel"
-                    )
-
-                return tecnicos_data
+                # Resolve the required cells of a row with one C-level call.
+                # Data rows are cut (or padded with None) at the last required
+                # column, whatever width the sheet reports.
+                col_indices = [header_map[col] for col in required_columns]
+                get_required = itemgetter(*col_indices)
+                rows = ws.iter_rows(
+                    min_row=2, max_col=max(col_indices) + 1, values_only=True
+                )
 
-            finally:
-                # Clean up temporary file
-                if os.path.exists(temp_filepath):
-                    os.unlink(temp_filepath)
+                # Process data rows
+                found_rows = False
+                blank_rows = 0
+                for row in rows:
+                    # Stop at the empty tail of the sheet
+                    if row.count(None) == len(row):
+                        blank_rows += 1
+                        if blank_rows >= MAX_BLANK_EXCEL_ROWS:
+                            break
+                        continue
+                    blank_rows = 0
+
+                    # Skip rows with an empty required cell before converting
+                    required_values = get_required(row)
+                    if None in required_values:
+                        continue
+                    values = [str(cell_value).strip() for cell_value in required_values]
+
+                    # Only add rows with every required field filled
+                    if all(values):
+                        found_rows = True
+                        yield dict(zip(required_columns, values, strict=True))
+
+            if not found_rows:
+                raise ValueError("No se encontraron datos válidos en el archivo Excel")
 
-        except ImportError as e:
-            raise RuntimeError(
-                "La librería openpyxl no está disponible. Instale con: pip install openpyxl"
-            ) from e
         except Exception as e:
             if isinstance(e, (ValueError, RuntimeError)):
                 raise
@@ -0,0 +1,48 @@
+from typing import Any
+from uuid import UUID
+
+from src.models import db
+from src.models.upload_job import UploadJob
+
+
+class UploadJobService:
+    """Service for tracking uploads processed in the background."""
+
+    def create_job(self, kind: str) -> UploadJob:
+        """
+        Create a pending upload job.
+
+        Args:
+            kind: What the upload loads (e.g. "historia_south", "empresas_externas")
+
+        Returns:
+            Created UploadJob instance
+        """
+        job = UploadJob(kind=kind, status=UploadJob.STATUS_PENDING)
+        db.session.add(job)
+        db.session.commit()
+        return job
+
+    def get_job_by_uuid(self, job_uuid: UUID) -> UploadJob | None:
+        """Get upload job by uuid"""
+        return UploadJob.query.filter_by(uuid=job_uuid).first()
+
+    def mark_running(self, job_id: int) -> None:
+        """Mark the job as being processed"""
+        self._update(job_id, status=UploadJob.STATUS_RUNNING)
+
+    def mark_done(self, job_id: int, result: Any = None) -> None:
+        """Mark the job as finished and store its JSON-serializable result"""
+        self._update(job_id, status=UploadJob.STATUS_DONE, result=result)
+
+    def mark_failed(self, job_id: int, error: str) -> None:
+        """Mark the job as failed with a message that can be shown to the client"""
+        self._update(job_id, status=UploadJob.STATUS_ERROR, error=error[:512])
+
+    def _update(self, job_id: int, **values: Any) -> None:
+        try:
+            UploadJob.query.filter_by(id=job_id).update(values)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
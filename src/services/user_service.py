@@ -1,8 +1,34 @@
 from typing import Optional
 
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+from src.cache import cache
 from src.models import db
 from src.models.auth.user import Role, User, UserEmpresa, UserRole
 from src.models.empresas_externas_toa import EmpresasExternasToa
+from src.services.empresas_externas_service import (
+    EmpresaSnapshot,
+    get_empresas_snapshot,
+)
+
+# Seconds a role id is served from the cache; roles are seeded by migrations
+ROLE_ID_CACHE_TTL = 3600
+
+
+@cache.memoize(timeout=ROLE_ID_CACHE_TTL)
+def _get_role_id(name: str) -> int | None:
+    """Cached id of a role; a missing role (None) is not cached."""
+    return db.session.execute(
+        select(Role.id).where(Role.name == name)
+    ).scalar_one_or_none()
+
+
+def _empresa_exists(empresa_id: int) -> bool:
+    """EXISTS check on the empresa; the cached snapshot may miss new empresas."""
+    return db.session.query(
+        select(EmpresasExternasToa.id).filter_by(id=empresa_id).exists()
+    ).scalar()
 
 
 class UserService:
@@ -31,18 +57,19 @@ class UserService:
         """
         try:
             # Check if username already exists among active users
-            existing_user = User.active_records().filter_by(username=username).first()
-            if existing_user:
+            username_taken = db.session.query(
+                User.active_records().filter_by(username=username).exists()
+            ).scalar()
+            if username_taken:
                 raise ValueError(f"El usuario '{username}' ya existe")
 
             # Check if empresa exists
-            empresa = EmpresasExternasToa.query.get(empresa_id)
-            if not empresa:
+            if not _empresa_exists(empresa_id):
                 raise ValueError(f"La empresa con ID {empresa_id} no existe")
 
             # Get supervisor role
-            supervisor_role = Role.query.filter_by(name="supervisor").first()
-            if not supervisor_role:
+            supervisor_role_id = _get_role_id("supervisor")
+            if supervisor_role_id is None:
                 raise ValueError("El rol 'supervisor' no existe en el sistema")
 
             # Create new user
@@ -51,7 +78,7 @@ class UserService:
             db.session.flush()  # To get the user ID
 
             # Assign supervisor role
-            user_role = UserRole(user_id=new_user.id, role_id=supervisor_role.id)
+            user_role = UserRole(user_id=new_user.id, role_id=supervisor_role_id)
             db.session.add(user_role)
 
             # Assign empresa
@@ -65,6 +92,14 @@ class UserService:
             # Re-raise validation errors
             db.session.rollback()
             raise
+        except IntegrityError as e:
+            # The checks above can race with other requests (or the cached
+            # role id be stale); the constraints have the last word
+            db.session.rollback()
+            raise ValueError(
+                f"El usuario '{username}' ya existe o la empresa con ID "
+                f"{empresa_id} no existe"
+            ) from e
         except Exception as e:
             db.session.rollback()
             raise RuntimeError(f"Error al crear el usuario: {str(e)}") from e
@@ -122,34 +157,42 @@ class UserService:
             # Update username if provided
             if username is not None:
                 # Check if new username already exists among active users (excluding current user)
-                existing_user = (
+                username_taken = db.session.query(
                     User.active_records()
                     .filter(User.username == username, User.id != user_id)
-                    .first()
-                )
-                if existing_user:
+                    .exists()
+                ).scalar()
+                if username_taken:
                     raise ValueError(f"El usuario '{username}' ya existe")
                 user.username = username
 
             # Update password if provided
             if password is not None:
-                from werkzeug.security import generate_password_hash
-
-                user.password = generate_password_hash(password)
+                user.set_password(password)
 
             # Update empresa if provided
             if empresa_id is not None:
                 # Check if empresa exists
-                empresa = EmpresasExternasToa.query.get(empresa_id)
-                if not empresa:
+                if not _empresa_exists(empresa_id):
                     raise ValueError(f"La empresa con ID {empresa_id} no existe")
 
-                # Remove existing empresa assignments
-                UserEmpresa.query.filter_by(user_id=user_id).delete()
-
-                # Add new empresa assignment
-                user_empresa = UserEmpresa(user_id=user_id, empresa_id=empresa_id)
-                db.session.add(user_empresa)
+                current_empresa_ids = user.get_empresa_ids()
+                if current_empresa_ids == [empresa_id]:
+                    pass  # Same assignment, nothing to write
+                elif len(current_empresa_ids) == 1:
+                    # Repoint the single assignment in place
+                    db.session.execute(
+                        update(UserEmpresa)
+                        .where(UserEmpresa.user_id == user_id)
+                        .values(empresa_id=empresa_id)
+                    )
+                else:
+                    # Remove existing empresa assignments
+                    UserEmpresa.query.filter_by(user_id=user_id).delete()
+
+                    # Add new empresa assignment
+                    user_empresa = UserEmpresa(user_id=user_id, empresa_id=empresa_id)
+                    db.session.add(user_empresa)
 
             db.session.commit()
             return user
@@ -177,18 +220,28 @@ class UserService:
             RuntimeError: If database operation fails
         """
         try:
-            user = User.query.get(user_id)
-            if not user or not user.active:
-                return False
-
-            # Prevent deletion of 'dev' user
-            if user.username == "dev":
-                raise ValueError("No se puede eliminar el usuario 'dev'")
-
-            # Soft delete user (mark as inactive)
-            user.soft_delete()
+            # Soft delete with a single UPDATE; the 'dev' user is excluded here
+            result = db.session.execute(
+                update(User)
+                .where(
+                    User.id == user_id,
+                    User.active.is_(True),
+                    User.username != "dev",
+                )
+                .values(active=False)
+            )
             db.session.commit()
-            return True
+            if result.rowcount > 0:
+                return True
+
+            # Nothing updated: tell the protected 'dev' user apart from a missing
+            # or already inactive one
+            username = db.session.execute(
+                select(User.username).where(User.id == user_id, User.active.is_(True))
+            ).scalar()
+            if username == "dev":
+                raise ValueError("No se puede eliminar el usuario 'dev'")
+            return False
 
         except ValueError:
             # Re-raise validation errors
@@ -212,24 +265,24 @@ class UserService:
             RuntimeError: If database operation fails
         """
         try:
-            user = User.query.get(user_id)
-            if not user or user.active:
-                return False
-
-            # Restore user (mark as active)
-            user.restore()
+            # Restore with a single UPDATE; only inactive users are touched
+            result = db.session.execute(
+                update(User)
+                .where(User.id == user_id, User.active.is_(False))
+                .values(active=True)
+            )
             db.session.commit()
-            return True
+            return result.rowcount > 0
 
         except Exception:
             db.session.rollback()
             raise RuntimeError("Error al restaurar el usuario")
 
-    def get_all_empresas(self) -> list[EmpresasExternasToa]:
+    def get_all_empresas(self) -> tuple[EmpresaSnapshot, ...]:
         """
         Get all empresas for dropdown selection.
 
         Returns:
-            List of all EmpresasExternasToa instances
+            Cached snapshots (id, nombre, nombre_toa) of all empresas
         """
-        return EmpresasExternasToa.query.all()
+        return get_empresas_snapshot()
@@ -38,14 +38,35 @@ class ComentariosUseCase:
         Returns:
             True if user has access, False otherwise
         """
-        # Check if user is admin (dev user or has admin role)
-        is_admin = user.username == "dev" or user.has_roles(["admin"])
-
-        if is_admin:
+        if self._is_admin(user):
             return True
 
-        user_empresa_ids = [empresa.id for empresa in user.empresas]
-        return orden_trabajo.id_empresa in user_empresa_ids
+        return user.has_empresa(orden_trabajo.id_empresa)
+
+    @staticmethod
+    def _is_admin(user: User) -> bool:
+        """Admin users (dev user or admin role) have access to all ordenes."""
+        return user.username == "dev" or user.has_roles(["admin"])
+
+    def get_orden_trabajo_for_user(
+        self, user: User, codigo: str
+    ) -> OrdenTrabajo | None:
+        """
+        Get orden de trabajo by codigo if the user has access to it.
+
+        The empresa check is part of the query for non-admin users, so a
+        missing orden and an orden of another empresa both return None.
+
+        Args:
+            user: User requesting the orden
+            codigo: Orden de trabajo codigo
+
+        Returns:
+            OrdenTrabajo instance or None if not found or not accessible
+        """
+        if self._is_admin(user):
+            return self.orden_trabajo_service.get_orden_trabajo_by_codigo(codigo)
+        return self.orden_trabajo_service.get_orden_trabajo_for_user(codigo, user.id)
 
     def get_orden_trabajo_by_codigo(self, codigo: str) -> OrdenTrabajo | None:
         """
@@ -101,10 +122,8 @@ class ComentariosUseCase:
             raise ValueError("El número de ticket no puede exceder los 32 caracteres")
 
         # Get orden de trabajo and validate user access (combined for security)
-        orden_trabajo = self.get_orden_trabajo_by_codigo(codigo_orden_trabajo)
-        if not orden_trabajo or not self.validate_user_access_to_orden(
-            user, orden_trabajo
-        ):
+        orden_trabajo = self.get_orden_trabajo_for_user(user, codigo_orden_trabajo)
+        if not orden_trabajo:
             raise ValueError(ORDER_ACCESS_DENIED_MESSAGE.format(codigo_orden_trabajo))
 
         # Create comentario
@@ -144,19 +163,16 @@ class ComentariosUseCase:
         Raises:
             ValueError: If validation fails
         """
-        # Get orden de trabajo and validate user access (combined for security)
-        orden_trabajo = self.get_orden_trabajo_by_codigo(codigo_orden_trabajo)
-        if not orden_trabajo or not self.validate_user_access_to_orden(
-            user, orden_trabajo
-        ):
-            raise ValueError(ORDER_ACCESS_DENIED_MESSAGE.format(codigo_orden_trabajo))
-
-        # Get comentarios count
-        comentarios_count = (
-            self.comentarios_service.get_comentarios_count_by_orden_trabajo(
-                orden_trabajo.id
+        # Orden de trabajo, access check and comentarios count in a single
+        # round-trip; admins are not restricted to their empresas
+        orden_trabajo = (
+            self.comentarios_service.get_orden_trabajo_with_comentarios_count(
+                codigo_orden_trabajo,
+                user_id=None if self._is_admin(user) else user.id,
             )
         )
+        if not orden_trabajo:
+            raise ValueError(ORDER_ACCESS_DENIED_MESSAGE.format(codigo_orden_trabajo))
 
         return {
             "orden_trabajo": {
@@ -164,7 +180,7 @@ class ComentariosUseCase:
                 "codigo": orden_trabajo.codigo,
                 "id_empresa": orden_trabajo.id_empresa,
             },
-            "comentarios_count": comentarios_count,
+            "comentarios_count": orden_trabajo.comentarios_count,
         }
 
     def get_comentarios_for_orden(
@@ -186,10 +202,8 @@ class ComentariosUseCase:
             ValueError: If validation fails
         """
         # Get orden de trabajo and validate user access (combined for security)
-        orden_trabajo = self.get_orden_trabajo_by_codigo(codigo_orden_trabajo)
-        if not orden_trabajo or not self.validate_user_access_to_orden(
-            user, orden_trabajo
-        ):
+        orden_trabajo = self.get_orden_trabajo_for_user(user, codigo_orden_trabajo)
+        if not orden_trabajo:
             raise ValueError(ORDER_ACCESS_DENIED_MESSAGE.format(codigo_orden_trabajo))
 
         # Get comentarios
@@ -249,7 +263,7 @@ class ComentariosUseCase:
             }
 
         except Exception as e:
-            raise RuntimeError(f"Error al obtener comentarios: {str(e)}") from e
+            raise RuntimeError("Error al obtener comentarios") from e
 
     def get_all_comentarios_for_admin(
         self, page: int = 1, per_page: int = 20
@@ -313,7 +327,7 @@ class ComentariosUseCase:
             }
 
         except Exception as e:
-            raise RuntimeError(f"Error al obtener comentarios: {str(e)}") from e
+            raise RuntimeError("Error al obtener comentarios") from e
 
     def soft_delete_comentario(self, comentario_id: int) -> dict[str, Any]:
         """
@@ -330,17 +344,17 @@ class ComentariosUseCase:
             RuntimeError: If database operation fails
         """
         try:
-            # Get comentario to verify it exists
-            comentario = self.comentarios_service.get_comentario_by_id(comentario_id)
-            if not comentario:
-                raise ValueError(f"Comentario con ID {comentario_id} no encontrado")
+            # Soft delete the comentario; only looked up when nothing changed
+            if not self.comentarios_service.soft_delete_comentario(comentario_id):
+                comentario = self.comentarios_service.get_comentario_by_id(
+                    comentario_id
+                )
+                if not comentario:
+                    raise ValueError(f"Comentario con ID {comentario_id} no encontrado")
 
-            if not comentario.active:
-                raise ValueError("El comentario ya está inactivo")
+                if not comentario.active:
+                    raise ValueError("El comentario ya está inactivo")
 
-            # Soft delete the comentario
-            success = self.comentarios_service.soft_delete_comentario(comentario_id)
-            if not success:
                 raise RuntimeError("Error al desactivar el comentario")
 
             return {
@@ -370,17 +384,17 @@ class ComentariosUseCase:
             RuntimeError: If database operation fails
         """
         try:
-            # Get comentario to verify it exists
-            comentario = self.comentarios_service.get_comentario_by_id(comentario_id)
-            if not comentario:
-                raise ValueError(f"Comentario con ID {comentario_id} no encontrado")
+            # Restore the comentario; only looked up when nothing changed
+            if not self.comentarios_service.restore_comentario(comentario_id):
+                comentario = self.comentarios_service.get_comentario_by_id(
+                    comentario_id
+                )
+                if not comentario:
+                    raise ValueError(f"Comentario con ID {comentario_id} no encontrado")
 
-            if comentario.active:
-                raise ValueError("El comentario ya está activo")
+                if comentario.active:
+                    raise ValueError("El comentario ya está activo")
 
-            # Restore the comentario
-            success = self.comentarios_service.restore_comentario(comentario_id)
-            if not success:
                 raise RuntimeError("Error al restaurar el comentario")
 
             return {
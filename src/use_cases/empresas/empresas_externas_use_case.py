@@ -1,9 +1,9 @@
-import json
 from typing import Any
 
 from werkzeug.datastructures import FileStorage
 
 from src.services.empresas_externas_service import EmpresasExternasService
+from src.utils.json_stream import iter_json_array
 
 
 class EmpresasExternasUseCase:
@@ -38,11 +38,16 @@ class EmpresasExternasUseCase:
 
     def set_empresas_externas_toa(self, file: FileStorage) -> bool:
         try:
-            data = json.load(file)
-            for item in data:
-                self.empresas_externas_service.set_empresas_externas_toa(
-                    item["nombre"], item["nombre_toa"], item["rut"]
-                )
+            # Parsed incrementally, inserted with one executemany and commit
+            rows = [
+                {
+                    "nombre": item["nombre"],
+                    "nombre_toa": item["nombre_toa"],
+                    "rut": item["rut"],
+                }
+                for item in iter_json_array(file)
+            ]
+            self.empresas_externas_service.set_empresas_externas_toa_bulk(rows)
         except Exception as e:
             raise RuntimeError(
                 f"Error al setear las empresas externas en la base de datos: {e}"
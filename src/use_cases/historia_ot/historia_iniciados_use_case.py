@@ -1,8 +1,18 @@
-import json
-from typing import Any
+from typing import IO, Any
 
+from src.cache import cached_in_namespace
+from src.constants import TOA_DATE_FORMAT
 from src.services.empresas_externas_service import EmpresasExternasService
-from src.services.historia_iniciados_service import HistoriaIniciadosService
+from src.services.historia_iniciados_service import (
+    HISTORIA_CACHE_NAMESPACE,
+    HistoriaIniciadosService,
+)
+from src.utils.json_stream import iter_json_array
+
+# Seconds a historia API page (polled by dashboards) is served from the cache;
+# the pages are also keyed by the table fingerprint, so a load is never served
+# stale by another worker
+HISTORIA_API_CACHE_TTL = 60
 
 
 class HistoriaIniciadosUseCase:
@@ -14,14 +24,17 @@ class HistoriaIniciadosUseCase:
         self.historia_iniciados_service = historia_iniciados_service
         self.empresas_externas_service = empresas_externas_service
 
-    def set_data_zona(
-        self, data: list[dict[str, Any]], zona: str
-    ) -> list[dict[str, Any]]:
+    def set_data_zona(self, data: IO, zona: str) -> list[dict[str, Any]]:
         """
         Efficiently processes data for any zona by matching técnico names with empresas externas.
 
+        The JSON array is parsed incrementally and matched items are inserted
+        in batches as they are read, so memory stays bounded regardless of the
+        file size. The whole file is committed at once: if it turns out to be
+        malformed halfway, nothing is loaded and the upload can be retried.
+
         Args:
-            data: List of items to process, each containing a "Técnico" field
+            data: File containing a JSON array of items, each with a "Técnico" field
             zona: Zone name (sur, norte, centro, metropolitana, etc.)
 
         Returns:
@@ -33,50 +46,50 @@ class HistoriaIniciadosUseCase:
         )
         empresa_nombres = [empresa.nombre_toa for empresa in empresas_externas]
         ot_no_ingresadas = []
-        try:
-            data = json.load(data)
-        except Exception as e:
-            raise Exception(f"Error al cargar el archivo: {e}")
-        for item in data:
-            tecnico = item.get("Técnico", "")
-            empresa_encontrada = None
-            # Find the first matching empresa in the técnico field
-            # Handle None values gracefully
-            if tecnico is None:
-                tecnico = ""
-
-            for empresa_nombre in empresa_nombres:
-                if empresa_nombre in tecnico:
-                    empresa_encontrada = empresa_nombre
-                    break
-
-            if empresa_encontrada:
-                self.historia_iniciados_service.set_data_to_database(
-                    item, zona, empresa_encontrada
-                )
-            else:
-                ot_no_ingresadas.append(item)
-        ot_ingresadas = len(data) - len(ot_no_ingresadas)
+        ot_ingresadas = 0
+
+        def iter_matched_items():
+            nonlocal ot_ingresadas
+            for item in iter_json_array(data):
+                tecnico = item.get("Técnico", "")
+                empresa_encontrada = None
+                # Find the first matching empresa in the técnico field
+                # Handle None values gracefully
+                if tecnico is None:
+                    tecnico = ""
+
+                for empresa_nombre in empresa_nombres:
+                    if empresa_nombre in tecnico:
+                        empresa_encontrada = empresa_nombre
+                        break
+
+                if empresa_encontrada:
+                    ot_ingresadas += 1
+                    yield item, empresa_encontrada
+                else:
+                    ot_no_ingresadas.append(item)
+
+        self.historia_iniciados_service.set_data_to_database_bulk(
+            iter_matched_items(), zona
+        )
         cantidad_ot_rechazadas = len(ot_no_ingresadas)
         print(f"ot ingresadas: {ot_ingresadas}")
         print(f"ot rechazadas: {cantidad_ot_rechazadas}")
         return ot_no_ingresadas
 
-    def set_data_zona_sur(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def set_data_zona_sur(self, data: IO) -> list[dict[str, Any]]:
         """Process data for zona sur"""
         return self.set_data_zona(data, "sur")
 
-    def set_data_zona_norte(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def set_data_zona_norte(self, data: IO) -> list[dict[str, Any]]:
         """Process data for zona norte"""
         return self.set_data_zona(data, "norte")
 
-    def set_data_zona_centro(self, data: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    def set_data_zona_centro(self, data: IO) -> list[dict[str, Any]]:
         """Process data for zona centro"""
         return self.set_data_zona(data, "centro")
 
-    def set_data_zona_metropolitana(
-        self, data: list[dict[str, Any]]
-    ) -> list[dict[str, Any]]:
+    def set_data_zona_metropolitana(self, data: IO) -> list[dict[str, Any]]:
         """Process data for zona metropolitana"""
         return self.set_data_zona(data, "metropolitana")
 
@@ -88,10 +101,53 @@ class HistoriaIniciadosUseCase:
             raise ValueError("Error al setear la empresa externa en la base de datos")
         return True
 
+    @staticmethod
+    def _historia_record_to_dict(record) -> dict[str, Any]:
+        return {
+            "id": record.id,
+            "zona": record.zona,
+            "orden_de_trabajo": record.orden_de_trabajo,
+            "empresa": record.empresa,
+            "tecnico": record.tecnico,
+            "coord_x": record.coord_x,
+            "coord_y": record.coord_y,
+            "duracion": record.duracion,
+            "estado": record.estado,
+            "fecha": record.fecha.strftime(TOA_DATE_FORMAT),
+            "flag_consulta_vecino": record.flag_consulta_vecino,
+            "flag_estado_aprovision": record.flag_estado_aprovision,
+            "flag_fallas_masivas": record.flag_fallas_masivas,
+            "flag_materiales": record.flag_materiales,
+            "flag_niveles": record.flag_niveles,
+            "hora_flag_estado_aprovision": record.hora_flag_estado_aprovision,
+            "hora_flag_fallas_masivas": record.hora_flag_fallas_masivas,
+            "hora_flag_materiales": record.hora_flag_materiales,
+            "hora_flag_niveles": record.hora_flag_niveles,
+            "inicio": record.inicio,
+            "intervencion_neutra": record.intervencion_neutra,
+            "notas_consulta_vecino": record.notas_consulta_vecino,
+            "notas_consulta_vecino_ultimo": record.notas_consulta_vecino_ultimo,
+            "qr_drop": record.qr_drop,
+            "rut_tecnico": record.rut_tecnico,
+            "tipo_red_producto": record.tipo_red_producto,
+            "hora_ultima_vecino": record.hora_ultima_vecino,
+            "hora_qr": record.hora_qr,
+            "tipo_actividad": record.tipo_actividad,
+            "zona_de_trabajo": record.zona_de_trabajo,
+            "pasos": record.pasos,
+            "pelo": record.pelo,
+            "created_at": record.created_at.isoformat(),
+            "updated_at": record.updated_at.isoformat(),
+            "active": record.active,
+        }
+
     def get_all_historia_ot_empresas(self) -> dict[str, Any]:
         """
         Get all historia OT empresas from the system.
 
+        Records are streamed from the database in chunks, so only the
+        serialized rows are kept in memory, not the ORM instances.
+
         Returns:
             Dictionary with all historia OT empresas data
 
@@ -99,54 +155,57 @@ class HistoriaIniciadosUseCase:
             RuntimeError: If database operation fails
         """
         try:
-            # Get all historia records through service
-            historia_records = self.historia_iniciados_service.get_historia_iniciados()
+            historia_ot_empresas = [
+                self._historia_record_to_dict(record)
+                for record in self.historia_iniciados_service.iter_historia_iniciados()
+            ]
+            return {
+                "historia_ot_empresas": historia_ot_empresas,
+                "total": len(historia_ot_empresas),
+            }
+
+        except Exception as e:
+            raise RuntimeError("Error al obtener historia OT empresas") from e
+
+    @cached_in_namespace(
+        HISTORIA_CACHE_NAMESPACE, timeout=HISTORIA_API_CACHE_TTL, ignore_self=True
+    )
+    def get_historia_ot_empresas_page(
+        self, page: int = 1, per_page: int = 1000, data_version: str | None = None
+    ) -> dict[str, Any]:
+        """
+        Get one page of historia OT empresas, ordered by id.
+
+        Args:
+            page: Page number (1-based)
+            per_page: Number of records per page
+            data_version: Fingerprint of the historia table; only part of the
+                cache key, so a changed table never hits an old page
+
+        Returns:
+            Dictionary with the page records and pagination data
 
+        Raises:
+            RuntimeError: If database operation fails
+        """
+        try:
+            paginated = self.historia_iniciados_service.get_historia_iniciados_paginated(
+                page, per_page
+            )
             return {
                 "historia_ot_empresas": [
-                    {
-                        "id": record.id,
-                        "zona": record.zona,
-                        "orden_de_trabajo": record.orden_de_trabajo,
-                        "empresa": record.empresa,
-                        "tecnico": record.tecnico,
-                        "coord_x": record.coord_x,
-                        "coord_y": record.coord_y,
-                        "duracion": record.duracion,
-                        "estado": record.estado,
-                        "fecha": record.fecha,
-                        "flag_consulta_vecino": record.flag_consulta_vecino,
-                        "flag_estado_aprovision": record.flag_estado_aprovision,
-                        "flag_fallas_masivas": record.flag_fallas_masivas,
-                        "flag_materiales": record.flag_materiales,
-                        "flag_niveles": record.flag_niveles,
-                        "hora_flag_estado_aprovision": record.hora_flag_estado_aprovision,
-                        "hora_flag_fallas_masivas": record.hora_flag_fallas_masivas,
-                        "hora_flag_materiales": record.hora_flag_materiales,
-                        "hora_flag_niveles": record.hora_flag_niveles,
-                        "inicio": record.inicio,
-                        "intervencion_neutra": record.intervencion_neutra,
-                        "notas_consulta_vecino": record.notas_consulta_vecino,
-                        "notas_consulta_vecino_ultimo": record.notas_consulta_vecino_ultimo,
-                        "qr_drop": record.qr_drop,
-                        "rut_tecnico": record.rut_tecnico,
-                        "tipo_red_producto": record.tipo_red_producto,
-                        "hora_ultima_vecino": record.hora_ultima_vecino,
-                        "hora_qr": record.hora_qr,
-                        "tipo_actividad": record.tipo_actividad,
-                        "zona_de_trabajo": record.zona_de_trabajo,
-                        "pasos": record.pasos,
-                        "pelo": record.pelo,
-                        "created_at": record.created_at.isoformat(),
-                        "updated_at": record.updated_at.isoformat(),
-                        "active": record.active,
-                    }
-                    for record in historia_records
+                    self._historia_record_to_dict(record) for record in paginated.items
                 ],
-                "total": len(historia_records),
+                "pagination": {
+                    "page": paginated.page,
+                    "per_page": paginated.per_page,
+                    "pages": paginated.pages,
+                    "total": paginated.total,
+                    "has_prev": paginated.has_prev,
+                    "has_next": paginated.has_next,
+                },
+                "total": paginated.total,
             }
 
         except Exception as e:
-            raise RuntimeError(
-                f"Error al obtener historia OT empresas: {str(e)}"
-            ) from e
+            raise RuntimeError("Error al obtener historia OT empresas") from e
@@ -13,6 +13,18 @@ class OrdenTrabajoUseCase:
         self.orden_trabajo_service = orden_trabajo_service
         self.empresas_externas_service = empresas_externas_service
 
+    def get_empresa_ids(self) -> set[int]:
+        """
+        Get the IDs of all empresas in the database.
+
+        Returns:
+            Set of empresa IDs, empty if the lookup fails
+        """
+        try:
+            return self.empresas_externas_service.get_empresa_ids()
+        except Exception:
+            return set()
+
     def validate_empresa_exists(self, id_empresa: int) -> bool:
         """
         Validate that the empresa exists in the database.
@@ -23,14 +35,7 @@ class OrdenTrabajoUseCase:
         Returns:
             True if empresa exists, False otherwise
         """
-        try:
-            empresas = self.empresas_externas_service.get_empresas_externas_toa_all()
-            empresa_ids = [
-                empresa.id for empresa in empresas
-            ]  # Fixed: use .id instead of ["id"]
-            return id_empresa in empresa_ids
-        except Exception:
-            return False
+        return id_empresa in self.get_empresa_ids()
 
     def add_ordenes_trabajo(self, ordenes_data: list[dict[str, Any]]) -> dict[str, Any]:
         """
@@ -53,7 +58,8 @@ class OrdenTrabajoUseCase:
         if not ordenes_data:
             raise ValueError("Los datos de entrada no pueden estar vacíos")
 
-        # Validate each orden data
+        # Validate each orden data against a single snapshot of the empresas
+        empresa_ids = self.get_empresa_ids()
         validated_ordenes = []
         validation_errors = []
 
@@ -82,7 +88,7 @@ class OrdenTrabajoUseCase:
                 continue
 
             # Validate empresa exists
-            if not self.validate_empresa_exists(id_empresa):
+            if id_empresa not in empresa_ids:
                 validation_errors.append(codigo)
                 continue
 
@@ -109,6 +115,11 @@ class OrdenTrabajoUseCase:
                 message_parts.append(
                     f"Se omitieron {result['skipped_count']} órdenes existentes"
                 )
+            if result["duplicated_count"] > 0:
+                message_parts.append(
+                    f"Se omitieron {result['duplicated_count']} códigos "
+                    "repetidos en la carga"
+                )
             if len(all_errors) > 0:
                 message_parts.append(f"Se encontraron {len(all_errors)} errores")
 
@@ -123,6 +134,7 @@ class OrdenTrabajoUseCase:
                 "message": message,
                 "inserted": result["inserted"],
                 "not_inserted": result["not_inserted"],
+                "duplicated": result["duplicated"],
                 "errors": all_errors,
             }
 
@@ -133,6 +145,9 @@ class OrdenTrabajoUseCase:
         """
         Get all ordenes de trabajo from the system.
 
+        Records are streamed from the database in chunks, so only the
+        serialized rows are kept in memory, not the ORM instances.
+
         Returns:
             Dictionary with all ordenes de trabajo data
 
@@ -140,23 +155,21 @@ class OrdenTrabajoUseCase:
             RuntimeError: If database operation fails
         """
         try:
-            # Get all ordenes through service
-            ordenes = self.orden_trabajo_service.get_ordenes_trabajo_all()
-
+            ordenes = [
+                {
+                    "id": orden.id,
+                    "codigo": orden.codigo,
+                    "id_empresa": orden.id_empresa,
+                    "created_at": orden.created_at.isoformat(),
+                    "updated_at": orden.updated_at.isoformat(),
+                    "active": orden.active,
+                }
+                for orden in self.orden_trabajo_service.iter_ordenes_trabajo_all()
+            ]
             return {
-                "ordenes_trabajo": [
-                    {
-                        "id": orden.id,
-                        "codigo": orden.codigo,
-                        "id_empresa": orden.id_empresa,
-                        "created_at": orden.created_at.isoformat(),
-                        "updated_at": orden.updated_at.isoformat(),
-                        "active": orden.active,
-                    }
-                    for orden in ordenes
-                ],
+                "ordenes_trabajo": ordenes,
                 "total": len(ordenes),
             }
 
         except Exception as e:
-            raise RuntimeError(f"Error al obtener órdenes de trabajo: {str(e)}") from e
+            raise RuntimeError("Error al obtener órdenes de trabajo") from e
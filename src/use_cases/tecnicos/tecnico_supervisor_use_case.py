@@ -1,6 +1,9 @@
+from collections.abc import Iterator
 from typing import Any
 
+from src.models import db
 from src.models.auth.user import User
+from src.models.empresas_externas_toa import EmpresasExternasToa
 from src.services.tecnico_supervisor_service import TecnicoSupervisorService
 
 # Constants
@@ -24,8 +27,7 @@ class TecnicoSupervisorUseCase:
         Returns:
             True if user has access, False otherwise
         """
-        user_empresa_ids = [empresa.id for empresa in user.empresas]
-        return id_empresa in user_empresa_ids
+        return user.has_empresa(id_empresa)
 
     def add_tecnicos_supervisores(
         self, user: User, tecnicos_data: list[dict[str, Any]]
@@ -129,6 +131,15 @@ class TecnicoSupervisorUseCase:
                 message_parts.append(
                     f"Se crearon {result['created_count']} técnicos exitosamente"
                 )
+            if result["skipped_count"] > 0:
+                message_parts.append(
+                    f"Se omitieron {result['skipped_count']} técnicos existentes"
+                )
+            if result["duplicated_count"] > 0:
+                message_parts.append(
+                    f"Se omitieron {result['duplicated_count']} RUT "
+                    "repetidos en la carga"
+                )
 
             message = (
                 ". ".join(message_parts)
@@ -141,6 +152,8 @@ class TecnicoSupervisorUseCase:
                 "message": message,
                 "created_count": result["created_count"],
                 "created_ids": result["created_ids"],
+                "skipped_count": result["skipped_count"],
+                "duplicated_count": result["duplicated_count"],
                 "total_count": result["total_count"],
             }
 
@@ -189,25 +202,28 @@ class TecnicoSupervisorUseCase:
         """
         Get all tecnicos supervisores from all empresas.
 
+        Records are streamed from the database in chunks, so only the
+        serialized rows are kept in memory, not the ORM instances.
+
         Returns:
             Dictionary with all tecnicos data
         """
-        tecnicos = self.tecnico_supervisor_service.get_all_tecnicos_supervisores()
-
+        rows = self.tecnico_supervisor_service.iter_all_tecnicos_supervisores()
+        tecnicos = [
+            {
+                "id": tecnico.id,
+                "nombre_tecnico": tecnico.nombre_tecnico,
+                "rut_tecnico": tecnico.rut_tecnico,
+                "nombre_supervisor": tecnico.nombre_supervisor,
+                "id_empresa": tecnico.id_empresa,
+                "created_at": tecnico.created_at.isoformat(),
+                "updated_at": tecnico.updated_at.isoformat(),
+                "active": tecnico.active,
+            }
+            for tecnico in rows
+        ]
         return {
-            "tecnicos_supervisores": [
-                {
-                    "id": tecnico.id,
-                    "nombre_tecnico": tecnico.nombre_tecnico,
-                    "rut_tecnico": tecnico.rut_tecnico,
-                    "nombre_supervisor": tecnico.nombre_supervisor,
-                    "id_empresa": tecnico.id_empresa,
-                    "created_at": tecnico.created_at.isoformat(),
-                    "updated_at": tecnico.updated_at.isoformat(),
-                    "active": tecnico.active,
-                }
-                for tecnico in tecnicos
-            ],
+            "tecnicos_supervisores": tecnicos,
             "total": len(tecnicos),
         }
 
@@ -231,66 +247,16 @@ class TecnicoSupervisorUseCase:
             raise ValueError("Solo el usuario dev puede cargar archivos Excel")
 
         try:
-            # Process the Excel file
-            excel_data = self.tecnico_supervisor_service.process_excel_file(
-                file_storage
-            )
-
-            if not excel_data:
-                raise ValueError("No se encontraron datos válidos en el archivo")
-
-            # Transform Excel data to match the expected format
-            # Dev user can specify any id_empresa through Excel
-            tecnicos_data = []
-            invalid_empresas = set()
-
-            for row_data in excel_data:
-                # Ensure required fields exist (including id_empresa for dev)
-                required_fields = [
-                    "nombre_tecnico",
-                    "rut_tecnico",
-                    "nombre_supervisor",
-                    "id_empresa",
-                ]
-                if not all(
-                    key in row_data and str(row_data[key]).strip()
-                    for key in required_fields
-                ):
-                    continue  # Skip incomplete rows
-
-                # Validate and convert id_empresa
-                try:
-                    id_empresa = int(row_data["id_empresa"])
-                except (ValueError, TypeError):
-                    invalid_empresas.add(str(row_data.get("id_empresa", "N/A")))
-                    continue
-
-                # Validate that empresa exists
-                if not self._validate_empresa_exists(id_empresa):
-                    invalid_empresas.add(str(id_empresa))
-                    continue
-
-                tecnico_data = {
-                    "nombre_tecnico": row_data["nombre_tecnico"],
-                    "rut_tecnico": row_data["rut_tecnico"],
-                    "nombre_supervisor": row_data["nombre_supervisor"],
-                    "id_empresa": id_empresa,
-                }
-                tecnicos_data.append(tecnico_data)
-
-            # Report invalid empresas if any
-            if invalid_empresas:
-                invalid_list = ", ".join(sorted(invalid_empresas))
-                raise ValueError(
-                    f"IDs de empresa inválidos o inexistentes: {invalid_list}"
-                )
-
-            if not tecnicos_data:
-                raise ValueError("No se encontraron registros válidos para procesar")
-
-            # Create records directly through service (skip user empresa validation)
+            # Rows flow from the sheet through validation into the chunked
+            # insert; nothing is committed if a check fails at the end
+            file_info = {
+                "filename": file_storage.filename,
+                "total_rows_in_file": 0,
+                "valid_rows_processed": 0,
+            }
+            excel_rows = self.tecnico_supervisor_service.iter_excel_rows(file_storage)
             result = self.tecnico_supervisor_service.create_tecnicos_supervisores_bulk(
-                tecnicos_data
+                self._iter_excel_tecnicos(excel_rows, file_info)
             )
 
             # Format result similar to add_tecnicos_supervisores
@@ -299,6 +265,15 @@ class TecnicoSupervisorUseCase:
                 message_parts.append(
                     f"Se crearon {result['created_count']} técnicos exitosamente"
                 )
+            if result["skipped_count"] > 0:
+                message_parts.append(
+                    f"Se omitieron {result['skipped_count']} técnicos existentes"
+                )
+            if result["duplicated_count"] > 0:
+                message_parts.append(
+                    f"Se omitieron {result['duplicated_count']} RUT "
+                    "repetidos en la carga"
+                )
 
             message = (
                 ". ".join(message_parts)
@@ -312,12 +287,10 @@ class TecnicoSupervisorUseCase:
                 "message": message,
                 "created_count": result["created_count"],
                 "created_ids": result["created_ids"],
+                "skipped_count": result["skipped_count"],
+                "duplicated_count": result["duplicated_count"],
                 "total_count": result["total_count"],
-                "file_info": {
-                    "filename": file_storage.filename,
-                    "total_rows_in_file": len(excel_data),
-                    "valid_rows_processed": len(tecnicos_data),
-                },
+                "file_info": file_info,
             }
 
             return formatted_result
@@ -331,6 +304,78 @@ class TecnicoSupervisorUseCase:
                 f"Error inesperado al procesar el archivo: {str(e)}"
             ) from e
 
+    def _iter_excel_tecnicos(
+        self, excel_rows: Iterator[dict[str, str]], file_info: dict[str, Any]
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Validate Excel rows as they are read and yield them ready to insert.
+
+        Rows with an unparseable or unknown id_empresa are skipped and
+        reported together once the file is exhausted, by raising so the
+        caller can roll back what was already inserted. Each empresa is
+        looked up once per file.
+
+        Args:
+            excel_rows: Rows from TecnicoSupervisorService.iter_excel_rows
+            file_info: Counters updated in place (total and valid rows)
+
+        Yields:
+            Tecnico data with id_empresa as int
+
+        Raises:
+            ValueError: If some id_empresa is invalid or no row is valid
+        """
+        required_fields = [
+            "nombre_tecnico",
+            "rut_tecnico",
+            "nombre_supervisor",
+            "id_empresa",
+        ]
+        valid_empresas = set()
+        invalid_empresas = set()
+
+        for row_data in excel_rows:
+            file_info["total_rows_in_file"] += 1
+
+            # Ensure required fields exist (including id_empresa for dev)
+            if not all(
+                key in row_data and str(row_data[key]).strip()
+                for key in required_fields
+            ):
+                continue  # Skip incomplete rows
+
+            # Validate and convert id_empresa
+            try:
+                id_empresa = int(row_data["id_empresa"])
+            except (ValueError, TypeError):
+                invalid_empresas.add(str(row_data.get("id_empresa", "N/A")))
+                continue
+
+            # Validate that empresa exists
+            if id_empresa not in valid_empresas:
+                if not self._validate_empresa_exists(id_empresa):
+                    invalid_empresas.add(str(id_empresa))
+                    continue
+                valid_empresas.add(id_empresa)
+
+            file_info["valid_rows_processed"] += 1
+            yield {
+                "nombre_tecnico": row_data["nombre_tecnico"],
+                "rut_tecnico": row_data["rut_tecnico"],
+                "nombre_supervisor": row_data["nombre_supervisor"],
+                "id_empresa": id_empresa,
+            }
+
+        # Report invalid empresas if any
+        if invalid_empresas:
+            invalid_list = ", ".join(sorted(invalid_empresas))
+            raise ValueError(
+                f"IDs de empresa inválidos o inexistentes: {invalid_list}"
+            )
+
+        if not file_info["valid_rows_processed"]:
+            raise ValueError("No se encontraron registros válidos para procesar")
+
     def _validate_empresa_exists(self, id_empresa: int) -> bool:
         """
         Validate that an empresa ID exists in the database.
@@ -342,11 +387,8 @@ class TecnicoSupervisorUseCase:
             True if empresa exists, False otherwise
         """
         try:
-            from src.models.empresas_externas_toa import EmpresasExternasToa
-
-            empresa = EmpresasExternasToa.query.filter_by(
-                id=id_empresa, active=True
-            ).first()
-            return empresa is not None
+            return db.session.query(
+                EmpresasExternasToa.query.filter_by(id=id_empresa, active=True).exists()
+            ).scalar()
         except Exception:
             return False
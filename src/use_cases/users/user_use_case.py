@@ -1,5 +1,6 @@
 from typing import Any
 
+from src.models.auth.user import User
 from src.services.user_service import UserService
 
 # Constants
@@ -97,8 +98,6 @@ class UserUseCase:
         Returns:
             Dictionary with inactive users data
         """
-        from src.models.auth.user import User
-
         # Get only inactive users
         inactive_users = User.query.filter_by(active=False).all()
 
@@ -0,0 +1,70 @@
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
+from typing import IO, Any
+
+from flask import Flask, current_app
+
+from src.app.extensions import services
+from src.models import db
+from src.models.upload_job import UploadJob
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Create the process-wide executor on first use (after gunicorn forks)."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="upload-job"
+                )
+    return _executor
+
+
+def start_upload_job(kind: str, process: Callable[[IO], Any], file: IO) -> UploadJob:
+    """
+    Process an uploaded file in the background.
+
+    A pending UploadJob row is created so any worker can report its status,
+    then ``process(file)`` runs on the executor inside an app context. The
+    job owns the file from here on and closes it when done. Jobs that are
+    still running when the process stops are left in the running state.
+
+    Args:
+        kind: What the upload loads, stored on the job
+        process: Callable that ingests the file and returns a JSON-serializable result
+        file: Open file positioned at the start of the upload
+
+    Returns:
+        The created UploadJob
+    """
+    app = current_app._get_current_object()
+    job = services.upload_job.create_job(kind)
+    _get_executor(app.config["UPLOAD_JOB_WORKERS"]).submit(
+        _run_upload_job, app, job.id, process, file
+    )
+    return job
+
+
+def _run_upload_job(
+    app: Flask, job_id: int, process: Callable[[IO], Any], file: IO
+) -> None:
+    with app.app_context():
+        job_service = services.upload_job
+        try:
+            job_service.mark_running(job_id)
+            with closing(file):
+                result = process(file)
+            job_service.mark_done(job_id, result)
+        except ValueError as e:
+            db.session.rollback()
+            job_service.mark_failed(job_id, str(e))
+        except Exception:
+            db.session.rollback()
+            app.logger.exception(f"Upload job {job_id} failed")
+            job_service.mark_failed(job_id, "Error inesperado al procesar el archivo")
@@ -1,9 +1,25 @@
 import base64
+import hashlib
+import hmac
 import os
-from functools import wraps
-
-from flask import current_app, flash, jsonify, redirect, request, url_for
+from functools import lru_cache, wraps
+from urllib.parse import urlencode
+
+from flask import (
+    Flask,
+    current_app,
+    flash,
+    g,
+    jsonify,
+    make_response,
+    redirect,
+    request,
+    url_for,
+)
 from flask_login import current_user
+from sqlalchemy import bindparam, func, select
+
+from src.models import TableVersion, db
 
 
 def require_token(expected_token: str = None):
@@ -131,6 +147,68 @@ def require_token_and_json(expected_token: str = None):
     return decorator
 
 
+@lru_cache(maxsize=8)
+def _get_login_path(app: Flask) -> str:
+    """
+    Resolve the path of the login view once per application and reuse it.
+
+    Args:
+        app: Application whose login view is resolved
+
+    Returns:
+        The login path, without script root nor query string
+    """
+    return app.url_map.bind("").build(app.login_manager.login_view)
+
+
+def require_session_cookie():
+    """
+    Decorator to reject anonymous requests before Flask-Login runs.
+
+    Requests that carry neither a session cookie nor a remember-me cookie
+    cannot belong to a logged in user, so they are sent to the login page
+    right away, skipping the user loader machinery and the URL map lookup
+    for the login view, which is resolved once. Use it on top of
+    ``login_required``, which still performs the real authentication.
+
+    Usage:
+        @require_session_cookie()
+        @login_required
+        def my_route():
+            return "Success"
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            session_cookie = current_app.config["SESSION_COOKIE_NAME"]
+            remember_cookie = current_app.config.get(
+                "REMEMBER_COOKIE_NAME", "remember_token"
+            )
+
+            if (
+                session_cookie not in request.cookies
+                and remember_cookie not in request.cookies
+            ):
+                login_manager = current_app.login_manager
+                if login_manager.login_message:
+                    flash(
+                        login_manager.login_message,
+                        login_manager.login_message_category,
+                    )
+                next_url = (request.script_root + request.full_path).rstrip("?")
+                login_url = request.script_root + _get_login_path(
+                    current_app._get_current_object()
+                )
+                return redirect(f"{login_url}?{urlencode({'next': next_url})}")
+
+            return f(*args, **kwargs)
+
+        return decorated_function
+
+    return decorator
+
+
 def dev_only(redirect_route: str = "main.welcome"):
     """
     Decorator to restrict access to the 'dev' user only.
@@ -171,6 +249,13 @@ def dev_only(redirect_route: str = "main.welcome"):
     return decorator
 
 
+@lru_cache(maxsize=8)
+def _expected_basic_auth_header(username: str, password: str) -> str:
+    """Build the Authorization header value matching the given credentials."""
+    credentials = base64.b64encode(f"{username}:{password}".encode())
+    return f"Basic {credentials.decode('ascii')}"
+
+
 def require_basic_auth(username: str = None, password: str = None):
     """
     Decorator to require HTTP Basic Authentication.
@@ -215,6 +300,16 @@ def require_basic_auth(username: str = None, password: str = None):
                 response.headers["WWW-Authenticate"] = 'Basic realm="Login Required"'
                 return response, 401
 
+            # Fast path: a well-formed header for the expected credentials is
+            # compared as a whole, without decoding it on every request
+            if hmac.compare_digest(
+                auth_header.encode("utf-8"),
+                _expected_basic_auth_header(
+                    expected_username, expected_password
+                ).encode("utf-8"),
+            ):
+                return f(*args, **kwargs)
+
             try:
                 # Decode base64 credentials
                 encoded_credentials = auth_header.split(" ")[1]
@@ -245,3 +340,101 @@ def require_basic_auth(username: str = None, password: str = None):
         return decorated_function
 
     return decorator
+
+
+# Change counters of the tables behind a listing (kept by a trigger on PostgreSQL)
+_TABLE_VERSIONS = (
+    select(TableVersion.table_name, func.sum(TableVersion.version))
+    .where(TableVersion.table_name.in_(bindparam("table_names", expanding=True)))
+    .group_by(TableVersion.table_name)
+)
+
+
+def _tables_fingerprint(models: tuple) -> str:
+    """
+    Fingerprint the current content of the given tables in a single query.
+
+    On PostgreSQL this sums the per-table change counters of table_versions,
+    a primary key range scan whatever the size of the tables. Other databases
+    (SQLite in development) fall back to (COUNT(*), MAX(updated_at)) per
+    table, which also changes on every insert, update or delete.
+
+    Raises:
+        RuntimeError: If a table has no table_versions rows; its ETag would
+            never change
+    """
+    if db.session.get_bind().dialect.name == "postgresql":
+        table_names = [model.__tablename__ for model in models]
+        versions = dict(
+            db.session.execute(_TABLE_VERSIONS, {"table_names": table_names}).all()
+        )
+        missing = sorted(set(table_names) - versions.keys())
+        if missing:
+            raise RuntimeError(
+                f"table_versions has no rows for: {', '.join(missing)}"
+            )
+        return "|".join(f"{name}={versions[name]}" for name in sorted(versions))
+
+    columns = []
+    for model in models:
+        columns.append(select(func.count(model.id)).scalar_subquery())
+        columns.append(select(func.max(model.updated_at)).scalar_subquery())
+    row = db.session.execute(select(*columns)).one()
+    return "|".join(str(value) for value in row)
+
+
+def _tables_etag(fingerprint: str) -> str:
+    """
+    ETag of a response built from tables with the given fingerprint.
+
+    The path and query string are part of it, so each page or filter of a
+    listing gets its own ETag.
+    """
+    etag_source = f"{request.full_path}|{fingerprint}"
+    return hashlib.blake2b(etag_source.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def conditional_on_tables(*models, max_age: int = 30):
+    """
+    Decorator adding ETag based conditional GET support to a JSON endpoint.
+
+    The ETag is derived from the tables backing the response. When the
+    client already holds the current version (If-None-Match), a 304 is
+    returned without running the view, so neither the full query nor the
+    JSON serialization is performed. The view can read the tables
+    fingerprint from ``g.tables_fingerprint`` to key its own caches, so a
+    cached body always matches the ETag it is sent with.
+
+    Args:
+        *models: Models whose tables make up the response; on PostgreSQL each
+            table needs the bump_version trigger and its table_versions rows
+        max_age: Seconds the client may reuse the response without asking
+
+    Usage:
+        @require_basic_auth()
+        @conditional_on_tables(OrdenTrabajo)
+        def get_all_ordenes():
+            return jsonify(...)
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            g.tables_fingerprint = _tables_fingerprint(models)
+            etag = _tables_etag(g.tables_fingerprint)
+
+            if request.if_none_match.contains(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+
+            response.set_etag(etag)
+            response.cache_control.private = True
+            response.cache_control.max_age = max_age
+            return response
+
+        return decorated_function
+
+    return decorator
@@ -0,0 +1,37 @@
+from flask import Blueprint, current_app, jsonify, request
+from werkzeug.exceptions import HTTPException
+
+
+def _handle_value_error(e: ValueError):
+    """Validation errors (data format, business rules, etc.)"""
+    return jsonify({"error": str(e)}), 400
+
+
+def _handle_runtime_error(e: RuntimeError):
+    """Database or system errors; details go to the log, not to the client"""
+    current_app.logger.exception(f"System error in {request.endpoint}")
+    return jsonify({"error": "Error del sistema. Inténtelo de nuevo."}), 500
+
+
+def _handle_unexpected_error(e: Exception):
+    """Unexpected errors; HTTP errors (404, 413, ...) keep their own response"""
+    if isinstance(e, HTTPException):
+        return e
+
+    current_app.logger.exception(f"Unexpected error in {request.endpoint}")
+    return jsonify({"error": "Error inesperado. Inténtelo de nuevo."}), 500
+
+
+def register_json_error_handlers(blueprint: Blueprint) -> None:
+    """
+    Register the JSON error responses shared by the API routes.
+
+    Routes of the blueprint can let ValueError, RuntimeError and unexpected
+    exceptions propagate instead of wrapping their body in try/except.
+
+    Args:
+        blueprint: Blueprint whose views should get the handlers
+    """
+    blueprint.register_error_handler(ValueError, _handle_value_error)
+    blueprint.register_error_handler(RuntimeError, _handle_runtime_error)
+    blueprint.register_error_handler(Exception, _handle_unexpected_error)
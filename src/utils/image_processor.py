@@ -4,10 +4,12 @@ Handles image compression, validation, and storage.
 """
 
 import os
+import tempfile
 import uuid
 from pathlib import Path
 from typing import Optional
 
+from flask import after_this_request, g, has_request_context
 from PIL import Image, ImageOps
 from werkzeug.datastructures import FileStorage
 
@@ -25,6 +27,9 @@ class ImageProcessor:
     MAX_WIDTH = 1920
     MAX_HEIGHT = 1080
     COMPRESSION_QUALITY = 85
+    # JPEGs are decoded at the smallest 1/2, 1/4 or 1/8 scale that still covers
+    # this box in either orientation, instead of at full camera resolution
+    DECODE_DRAFT_SIZE = (max(MAX_WIDTH, MAX_HEIGHT), max(MAX_WIDTH, MAX_HEIGHT))
 
     # Storage configuration
     UPLOAD_FOLDER = COMENTARIOS_UPLOAD_PATH
@@ -33,6 +38,10 @@ class ImageProcessor:
         """Initialize the image processor."""
         self.upload_folder = upload_folder or self.UPLOAD_FOLDER
         self._ensure_upload_directory()
+        # Register every PIL format plugin now (once per process, the services
+        # are singletons) instead of on the first upload of a format outside
+        # PIL's preinit set, such as WebP
+        Image.init()
 
     def _ensure_upload_directory(self) -> None:
         """Ensure the upload directory exists."""
@@ -131,27 +140,37 @@ class ImageProcessor:
         if not is_valid:
             return False, None, error_message
 
+        tmp_path = None
         try:
             # Generate unique filename
             filename = self.generate_filename(file.filename)
             file_path = os.path.join(self.upload_folder, filename)
 
-            # Open and process image
+            # Open and process image straight from the (disk-spooled) upload
             with Image.open(file.stream) as img:
+                img.draft("RGB", self.DECODE_DRAFT_SIZE)
                 processed_img = self.compress_image(img)
 
-                # Save compressed image
-                processed_img.save(
-                    file_path,
-                    format="JPEG",
-                    quality=self.COMPRESSION_QUALITY,
-                    optimize=True,
-                )
+                # Write next to the destination and move it into place, so a
+                # failed save never leaves a partial file under the final name
+                fd, tmp_path = tempfile.mkstemp(dir=self.upload_folder, suffix=".tmp")
+                with os.fdopen(fd, "wb") as out:
+                    processed_img.save(
+                        out,
+                        format="JPEG",
+                        quality=self.COMPRESSION_QUALITY,
+                        optimize=True,
+                    )
+                os.replace(tmp_path, file_path)
+                tmp_path = None
 
             return True, file_path, None
 
         except Exception as e:
             return False, None, f"Error al procesar imagen: {str(e)}"
+        finally:
+            if tmp_path:
+                self.delete_image(tmp_path)
 
     def delete_image(self, file_path: str) -> bool:
         """
@@ -171,6 +190,38 @@ class ImageProcessor:
         except Exception:
             return False
 
+    def delete_image_after_response(self, file_path: str) -> None:
+        """
+        Delete an image once the current response has been sent.
+
+        The paths scheduled during a request are removed together when the
+        server closes the response, so slow storage does not delay it.
+        Outside a request the image is deleted right away.
+
+        Args:
+            file_path: Path to the image file
+        """
+        if not file_path:
+            return
+        if not has_request_context():
+            self.delete_image(file_path)
+            return
+
+        pending = g.get("_images_to_delete")
+        if pending is None:
+            pending = g._images_to_delete = []
+
+            @after_this_request
+            def _delete_pending_images(response):
+                response.call_on_close(lambda: self._delete_images(pending))
+                return response
+
+        pending.append(file_path)
+
+    def _delete_images(self, file_paths: list[str]) -> None:
+        for file_path in file_paths:
+            self.delete_image(file_path)
+
     def get_image_info(self, file_path: str) -> Optional[dict]:
         """
         Get image information.
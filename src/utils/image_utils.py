@@ -2,12 +2,60 @@
 Image utility functions for serving and handling images.
 """
 
+import mimetypes
 import os
 from io import BytesIO
+from urllib.parse import quote
 
-from flask import send_file
+from flask import current_app, send_file
 from PIL import Image
 
+from src.constants import UPLOAD_PATH
+
+
+def send_image_file(full_image_path: str, check_exists: bool = False):
+    """
+    Send an uploaded image file.
+
+    When X_ACCEL_REDIRECT_PREFIX is configured and the image lives under
+    UPLOAD_PATH, the response only carries an ``X-Accel-Redirect`` header and
+    nginx streams the file itself (sendfile), freeing the worker. Otherwise
+    the file is sent by Flask as a conditional response, so clients holding
+    a cached copy get a 304 without the image bytes.
+
+    By default the file is not checked beforehand: with X-Accel-Redirect a
+    missing file is answered by nginx, otherwise the single stat done by
+    send_file raises.
+
+    Args:
+        full_image_path: Absolute path to the image file
+        check_exists: Also raise for a missing file when X-Accel-Redirect is
+            used, for callers that answer something else than nginx's 404
+
+    Returns:
+        Flask response for the image
+
+    Raises:
+        FileNotFoundError: If the file does not exist (Flask path, or
+            X-Accel-Redirect with check_exists)
+    """
+    accel_prefix = current_app.config.get("X_ACCEL_REDIRECT_PREFIX")
+    if accel_prefix:
+        relative_path = os.path.relpath(full_image_path, UPLOAD_PATH)
+        if not relative_path.startswith(os.pardir):
+            if check_exists and not os.path.isfile(full_image_path):
+                raise FileNotFoundError(full_image_path)
+            mimetype, _ = mimetypes.guess_type(full_image_path)
+            response = current_app.response_class(
+                mimetype=mimetype or "application/octet-stream"
+            )
+            response.headers["X-Accel-Redirect"] = (
+                f"{accel_prefix.rstrip('/')}/{quote(relative_path)}"
+            )
+            return response
+
+    return send_file(full_image_path, conditional=True, etag=True)
+
 
 def serve_default_placeholder_image():
     """
@@ -0,0 +1,57 @@
+from typing import Any
+
+import orjson
+from flask import Response, current_app
+from flask.json.provider import DefaultJSONProvider
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider that serializes jsonify responses with orjson.
+
+    The output matches DefaultJSONProvider: datetimes are passed through to
+    the default hook (RFC 822 strings), keys are sorted and non-string keys
+    are converted. Only response bodies and loads use orjson; dumps keeps
+    the stdlib encoder because template filters call it with json.dumps
+    keyword arguments.
+    """
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        option = (
+            orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_APPEND_NEWLINE
+        )
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option |= orjson.OPT_INDENT_2
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=option),
+            mimetype=self.mimetype,
+        )
+
+
+def ojsonify(data, status: int = 200):
+    """
+    Build a JSON response serialized with orjson.
+
+    Meant for the endpoints returning whole tables: unlike jsonify it skips
+    key sorting and the compatibility options of ORJSONProvider.
+
+    Args:
+        data: JSON serializable data (dict, list, str, numbers, ...)
+        status: HTTP status code
+
+    Returns:
+        Flask response with application/json mimetype
+    """
+    return current_app.response_class(
+        orjson.dumps(data), status=status, mimetype="application/json"
+    )
@@ -0,0 +1,26 @@
+from collections.abc import Iterator
+from typing import IO, Any
+
+import ijson
+
+
+def iter_json_array(file: IO) -> Iterator[Any]:
+    """
+    Yield the elements of a top-level JSON array one at a time.
+
+    The document is parsed incrementally, so memory use depends on the
+    size of a single element instead of the size of the whole file.
+
+    Args:
+        file: Binary file-like object containing a JSON array
+
+    Yields:
+        Each element of the array, with numbers decoded as float like json.load
+
+    Raises:
+        ValueError: If the content is not valid JSON
+    """
+    try:
+        yield from ijson.items(file, "item", use_float=True)
+    except ijson.JSONError as e:
+        raise ValueError(f"Error al cargar el archivo: {e}") from e
@@ -0,0 +1,39 @@
+import time
+
+from flask import Flask
+from sqlalchemy import event
+
+from src.models import db
+
+
+def register_slow_query_logging(app: Flask) -> None:
+    """
+    Log the SQL statements that take longer than SLOW_QUERY_THRESHOLD_MS.
+
+    The time is measured around the DBAPI cursor execution, so it covers the
+    database round-trip but not the ORM work done with the rows. Parameters
+    are left out of the log because they can contain personal data.
+
+    Args:
+        app: Flask app whose engine gets the listeners; a threshold of 0
+            disables the logging
+    """
+    threshold_ms = app.config.get("SLOW_QUERY_THRESHOLD_MS", 0)
+    if threshold_ms <= 0:
+        return
+
+    logger = app.logger
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        start = conn.info["query_start_time"].pop()
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if elapsed_ms >= threshold_ms:
+            logger.warning(f"Slow query ({elapsed_ms:.1f} ms): {statement}")
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)